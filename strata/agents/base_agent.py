@@ -1,6 +1,10 @@
 import re
 import json
 from stratapilot.utils import get_os_version
+from strata.utils.utils import tagged_pattern
+
+_JSON_BLOCK_RE = re.compile(r'```json\s*\n(\{[\s\S]*?\})\s*```')
+
 
 class BaseAgent:
     """
@@ -33,17 +37,8 @@ class BaseAgent:
             list[str]: A list of extracted substrings in the order they appear.
                        Returns an empty list if no matching segments are found.
         """
-        results = []
-        remaining = message
-        while True:
-            start = remaining.find(begin_str)
-            end = remaining.find(end_str, start + len(begin_str))
-            if start == -1 or end == -1:
-                break
-            payload = remaining[start + len(begin_str):end]
-            results.append(payload)
-            remaining = remaining[end + len(end_str):]
-        return results
+        pattern = tagged_pattern(begin_str, end_str)
+        return [match.group(1) for match in pattern.finditer(message)]
 
     def extract_json_from_string(self, text: str) -> dict | str:
         """
@@ -64,8 +59,7 @@ class BaseAgent:
             dict: The parsed JSON object if successful.
             str: An error message if no JSON block is found or if parsing fails.
         """
-        pattern = re.compile(r'```json\s*\n(\{[\s\S]*?\})\s*```')
-        match = pattern.search(text)
+        match = _JSON_BLOCK_RE.search(text)
         if not match:
             return "No JSON block found in the input text."
         json_str = match.group(1)
@@ -128,6 +128,8 @@ class FridayAgent(BaseAgent):
 
             else:
                 is_done = True
+                if status == 'Complete':
+                    self.executor.record_success(tool_name)
         else:
             # Non‑code tasks are considered complete immediately
             is_done = True
@@ -129,6 +129,8 @@ class FridayAgent(BaseAgent):
             else:
                 # Status "Complete" or unrecognized statuses default to done
                 is_done = True
+                if status == "Complete":
+                    self.executor.record_success(tool_name)
         else:
             # Non-code tasks are considered immediately complete
             is_done = True
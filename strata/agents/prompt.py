@@ -392,6 +392,24 @@ prompt = {
         3. 'API List' that includes the API path and their corresponding descriptions. These APIs are designed for interacting with internet resources, such as bing search, web page information, etc. 
         ''',
 
+        # Cache-friendly split of _USER_TASK_DECOMPOSE_PROMPT: the static half is stable
+        # across calls and is sent first so provider-side prompt caching can reuse it.
+        '_STATIC_TASK_DECOMPOSE_PROMPT': '''
+        User's information are as follows:
+        System Version: {system_version}
+        Tool List: {tool_list}
+        API List: {api_list}
+        Current Working Directiory: {working_dir}
+        Detailed description of user information:
+        1. 'Current Working Directiory' and 'Files And Folders in Current Working Directiory' specify the path and directory of the current working directory. These information may help you understand and generate subtasks.
+        2. 'Tool List' contains the name of each tool and the corresponding operation description. These tools are previously accumulated for completing corresponding subtasks. If a subtask corresponds to the description of a certain tool, then the subtask name and the tool name are the same, to facilitate the invocation of the relevant tool when executing the subtask.
+        3. 'API List' that includes the API path and their corresponding descriptions. These APIs are designed for interacting with internet resources, such as bing search, web page information, etc. 
+        ''',
+        '_DYNAMIC_TASK_DECOMPOSE_PROMPT': '''
+        Task: {task}
+        Files And Folders in Current Working Directiory: {files_and_folders}
+        ''',
+
         # Task replan prompts in os
         '_SYSTEM_TASK_REPLAN_PROMPT': '''
         You are an expert at designing new tasks based on the results of your reasoning.
@@ -450,6 +468,24 @@ prompt = {
         2. 'Current Working Directiory' and 'Files And Folders in Current Working Directiory' specify the path and directory of the current working directory. These information may help you understand and generate tasks.
         3. 'Tool List' contains the name of each tool and the corresponding operation description. These tools are previously accumulated for completing corresponding tasks. If a task corresponds to the description of a certain tool, then the task name and the tool name are the same, to facilitate the invocation of the relevant tool when executing the task.
         ''',
+
+        # Cache-friendly split of _USER_TASK_REPLAN_PROMPT
+        '_STATIC_TASK_REPLAN_PROMPT': '''
+        User's information are as follows:
+        System Version: {system_version}
+        Tool List: {tool_list}
+        Current Working Directiory: {working_dir}
+        Detailed description of user information:
+        1. 'Reasoning' indicates the reason why task execution failed and the corresponding solution, which can help you design new tasks.
+        2. 'Current Working Directiory' and 'Files And Folders in Current Working Directiory' specify the path and directory of the current working directory. These information may help you understand and generate tasks.
+        3. 'Tool List' contains the name of each tool and the corresponding operation description. These tools are previously accumulated for completing corresponding tasks. If a task corresponds to the description of a certain tool, then the task name and the tool name are the same, to facilitate the invocation of the relevant tool when executing the task.
+        ''',
+        '_DYNAMIC_TASK_REPLAN_PROMPT': '''
+        Current Task: {current_task}
+        Current Task Description: {current_task_description}
+        Reasoning: {reasoning}
+        Files And Folders in Current Working Directiory: {files_and_folders}
+        ''',
     },
 
     'retrieve_prompt': {
@@ -4,6 +4,7 @@ Original concept from Open Interpreter: https://github.com/OpenInterpreter/open-
 """
 
 import os
+import shlex
 from strata.environments import SubprocessEnv
 
 class AppleScript(SubprocessEnv):
@@ -33,7 +34,7 @@ class AppleScript(SubprocessEnv):
     def _wrap_script(self, code):
         """Package script with proper osascript arguments and completion marker."""
         cmd_lines = [
-            f'-e "{line.replace("\"", r"\"")}"'
+            f"-e {shlex.quote(line)}"
             for line in code.split("\n")
             if line.strip()  # Skip empty lines created by markers
         ]
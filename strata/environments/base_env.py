@@ -31,6 +31,7 @@ class BaseEnv:
             os.makedirs(self.working_dir)
 
         self.env_state: Union[EnvState, None] = None
+        self._ls_cache = None
 
     def step(self, code):
         """
@@ -68,28 +69,44 @@ class BaseEnv:
         if not os.path.exists(directory):
             return f"Directory '{directory}' does not exist."
 
-        # List files and directories
-        files_and_dirs = os.listdir(directory)
-
         # Create a list to store the details
         details = []
 
-        for name in files_and_dirs:
-            # Get the full path
-            full_path = os.path.join(directory, name)
-
-            # Get file or directory size
-            size = os.path.getsize(full_path)
+        # scandir hands back cached type info, so each entry costs one stat at most
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Get file or directory size
+                size = entry.stat().st_size
 
-            # Check if it's a file or directory
-            if os.path.isdir(full_path):
-                doc_type = 'Directory'
-            else:
-                doc_type = 'File'
+                # Check if it's a file or directory
+                if entry.is_dir():
+                    doc_type = 'Directory'
+                else:
+                    doc_type = 'File'
 
-            details.append(f"{name}\t {size} bytes\t {doc_type}")
+                details.append(f"{entry.name}\t {size} bytes\t {doc_type}")
 
         return "\n".join(details)
+
+    def list_working_dir_cached(self):
+        """
+        Same as `list_working_dir`, but reuses the last listing while the working
+        directory's mtime is unchanged.
+
+        The directory mtime moves whenever an entry is created, removed or renamed,
+        which is what planning prompts care about; sizes of files rewritten in place
+        may lag until the next such change.
+
+        Returns:
+            str: Detailed listings of the working directory's contents.
+        """
+        try:
+            stamp = (self.working_dir, os.stat(self.working_dir).st_mtime_ns)
+        except OSError:
+            return self.list_working_dir()
+        if self._ls_cache is None or self._ls_cache[0] != stamp:
+            self._ls_cache = (stamp, self.list_working_dir())
+        return self._ls_cache[1]
         
     def step(self, _command) -> EnvState:
         """
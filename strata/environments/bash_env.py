@@ -8,6 +8,9 @@ import platform
 import re
 from strata.environments import SubprocessEnv
 
+# The host OS is fixed for the life of the process; resolve it once at import
+_IS_WINDOWS = platform.system() == "Windows"
+
 class Shell(SubprocessEnv):
     """A shell environment for executing shell scripts with execution tracking."""
     
@@ -18,7 +21,7 @@ class Shell(SubprocessEnv):
     def __init__(self):
         """Initialize shell environment with platform-appropriate start command."""
         super().__init__()
-        self.start_cmd = ["cmd.exe"] if platform.system() == "Windows" else [
+        self.start_cmd = ["cmd.exe"] if _IS_WINDOWS else [
             os.environ.get("SHELL", "bash")
         ]
 
@@ -58,13 +61,12 @@ def add_active_line_prints(code):
         for i, line in enumerate(code.split("\n"))
     )
 
+_CONTINUATION_RE = re.compile(r'(\\|&&|\|\|?|\b(if|while|for|do|then)\b|[[({])$')
+
 def has_multiline_commands(script_text):
     """Detect potential multi-line shell constructs."""
-    patterns = (
-        r'(\\|&&|\|\|?|\b(if|while|for|do|then)\b|[[({]|\s+then\s*)$'
-    )
     return any(
-        re.search(patterns, line.rstrip())
+        _CONTINUATION_RE.search(line.rstrip())
         for line in script_text.splitlines()
     )
 
@@ -1,12 +1,8 @@
 # This code is based on Open Interpreter. Original source: https://github.com/OpenInterpreter/open-interpreter
-from stratapilot.environments import BaseEnv
-from stratapilot.environments import AppleScript
-from stratapilot.environments import PythonJupyterEnv
-from stratapilot.environments import Shell
-from stratapilot.utils.schema import EnvState
 
 import os
 import subprocess
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Generator
 
 
@@ -116,18 +112,47 @@ class AppleScript(Language):
             yield {"type": "console", "format": "output", "content": st.error}
 
 
+LANGUAGE_CLASSES = (PythonJupyterEnv, Shell, AppleScript)
+
+# name/alias -> class, resolved once so lookups never touch an instance
+_LANGUAGE_INDEX: Dict[str, type] = {
+    key.lower(): cls
+    for cls in LANGUAGE_CLASSES
+    for key in (cls.name, *cls.aliases)
+}
+
+
+@lru_cache(maxsize=None)
+def _language(cls: type) -> Language:
+    """
+    Construct a language backend on first use and share it afterwards.
+    """
+    return cls()
+
+
+def _list_dir(path: str) -> str:
+    """
+    Mimic plain `ls` output without spawning a process for it.
+    """
+    try:
+        names = sorted(n for n in os.listdir(path) if not n.startswith("."))
+    except OSError:
+        return ""
+    return "".join(f"{n}\n" for n in names)
+
+
 class Env:
     def __init__(self):
-        self.languages: List[Language] = [PythonJupyterEnv(), Shell(), AppleScript()]
         self._active: Dict[str, Language] = {}
         self.working_dir: str = os.getcwd()
 
+    @property
+    def languages(self) -> List[Language]:
+        return [_language(cls) for cls in LANGUAGE_CLASSES]
+
     def get_language(self, name: str) -> Optional[Language]:
-        key = name.lower()
-        for lang in self.languages:
-            if lang.name.lower() == key or key in (a.lower() for a in lang.aliases):
-                return lang
-        return None
+        cls = _LANGUAGE_INDEX.get(name.lower())
+        return _language(cls) if cls is not None else None
 
     def step(self, language: str, code: str, stream: bool = False, display: bool = False) -> Any:
         state = EnvState(command=code)
@@ -152,12 +177,7 @@ class Env:
                 lang.terminate()
 
         state.pwd = self.working_dir
-        try:
-            state.ls = subprocess.run(
-                ["ls"], cwd=self.working_dir, capture_output=True, text=True
-            ).stdout
-        except:
-            state.ls = ""
+        state.ls = _list_dir(self.working_dir)
 
         return state
 
@@ -8,6 +8,8 @@ import traceback
 from stratapilot.environments.base_env import BaseEnv
 from typing import Generator, Dict, Any
 
+_ACTIVE_LINE_MARKER_RE = re.compile(r"##active_line\d+##")
+
 class OutputMessage:
     def __init__(self, type: str, format: str, content: Any):
         self.type = type
@@ -107,7 +109,7 @@ class SubprocessEnv(BaseEnv):
             if self.detect_active_line(line) >= 0:
                 active = self.detect_active_line(line)
                 self.output_queue.put(OutputMessage('console', 'active_line', active))
-                cleaned = re.sub(r"##active_line\d+##", '', line)
+                cleaned = _ACTIVE_LINE_MARKER_RE.sub('', line)
                 if cleaned:
                     self.output_queue.put(OutputMessage('console', 'output', cleaned))
             elif self.detect_end_of_execution(line):
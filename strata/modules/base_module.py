@@ -1,15 +1,18 @@
 import re
 import json
 import os
-from dotenv import load_dotenv
+from strata.utils.env_bootstrap import ensure as ensure_env
 from strata.utils.llms import OpenAI, OLLAMA
 from strata.environments import Env
 from strata.utils import get_os_version
 
 # Load environment config
-load_dotenv(dotenv_path='.env', override=True)
+ensure_env()
 SELECTED_MODEL = os.getenv('MODEL_TYPE')
 
+_JSON_BLOCK_RE = re.compile(r'```json\n\s*\{\n.*\}\n\s*```', re.DOTALL)
+_BULLET_RE = re.compile(r'\d+\.\s+([^\n]*?)(?=\n\d+\.|\n\Z|\n\n)')
+
 class KernelBase:
     """
     Base component providing model binding and utility extraction methods
@@ -52,6 +55,28 @@ class KernelBase:
             end = text.find(end_tag)
         return results
 
+    def extract_return_value(self, output, start_tag='<return>', end_tag='</return>'):
+        """
+        Pulls the value a tool printed between its return markers.
+
+        Only the last marked block is taken, since the executor appends it after
+        the tool's own output. Slicing on the marker positions avoids running a
+        regex over the whole captured stdout.
+
+        Args:
+            output (str): Captured stdout of a tool run.
+            start_tag (str): Opening marker.
+            end_tag (str): Closing marker.
+
+        Returns:
+            str or None: The stripped value, or None if no block is present.
+        """
+        end = output.rfind(end_tag)
+        start = output.rfind(start_tag, 0, end)
+        if end == -1 or start == -1:
+            return None
+        return output[start + len(start_tag):end].strip()
+
     def parse_json_block(self, source_text):
         """
         Scans input for JSON fragments and attempts to decode them.
@@ -65,11 +90,11 @@ class KernelBase:
         Returns:
             dict or str: Parsed object or error message.
         """
-        pattern = r'```json\n\s*\{\n\s*[\s\S\n]*\}\n\s*```'
-        matches = re.findall(pattern, source_text)
+        match = _JSON_BLOCK_RE.search(source_text)
 
-        if matches:
-            snippet = matches[0].replace('```json', '').replace('```', '').strip()
+        if match:
+            # Strip the leading ```json and trailing ``` fences by position
+            snippet = match.group(0)[7:-3].strip()
             try:
                 return json.loads(snippet)
             except json.JSONDecodeError as e:
@@ -90,5 +115,4 @@ class KernelBase:
         Returns:
             list[str]: Extracted task descriptions.
         """
-        pattern = r'\d+\.\s+([^\n]*?)(?=\n\d+\.|\n\Z|\n\n)'
-        return re.findall(pattern, raw_text)
+        return _BULLET_RE.findall(raw_text)
@@ -1,10 +1,38 @@
 from strata.modules.base_module import BaseModule
+from strata.utils.plan_cache import PlanCache, default_cache_dir
 from strata.tool_repository.manager.tool_manager import get_open_api_doc_path
+import os
 import re
 import json
+import hashlib
 import subprocess
+import threading
+from functools import lru_cache
 from pathlib import Path
-from strata.utils.utils import send_chat_prompts, api_exception_mechanism
+from strata.utils.utils import send_chat_prompts, api_exception_mechanism, render_template, tagged_pattern
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used otherwise
+    orjson = None
+
+# Appended to generated Python tools so the planner can pick the value out of stdout
+_RESULT_WRAPPER = '\nresult={invoke}\nprint("<return>")\nprint(result)\nprint("</return>")'
+
+_JSON_OBJECT_RE = re.compile(r'{.*}', re.DOTALL)
+_SUMMARY_RE = re.compile(r'"""\s*\n\s*(.*?)[\.\n]')
+_PATH_RE = re.compile(
+    r"(/[^/\s]+(?:/[^/\s]*)*)"                  # unix
+    r"|([a-zA-Z]:\\(?:[^\\/\s]+\\)*[^\\/\s]+)"  # windows
+)
+
+
+@lru_cache(maxsize=None)
+def _load_api_documentation(path):
+    """Parse an OpenAPI document once per path and share it across handlers."""
+    with open(path, 'rb') as file:
+        raw = file.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
 
 
 class TaskHandler(BaseModule):
@@ -12,31 +40,75 @@ class TaskHandler(BaseModule):
     Handles dynamic tool generation, execution, evaluation, and persistence in a modular system.
     """
 
-    def __init__(self, prompt_config, tool_registry, retry_limit=3):
+    def __init__(self, prompt_config, tool_registry, retry_limit=3, skill_cache=None):
         super().__init__()
         self.prompt_config = prompt_config
         self.tool_registry = tool_registry
         self.retry_limit = retry_limit
+        # Code/invocation pairs that already passed judging, keyed by the generation
+        # inputs and the environment they were judged in
+        self.skill_cache = skill_cache if skill_cache is not None else PlanCache(
+            default_cache_dir("skill_cache")
+        )
         self.api_doc_path = get_open_api_doc_path()
-        with open(self.api_doc_path) as file:
-            self.api_documentation = json.load(file)
+        self.api_documentation = _load_api_documentation(self.api_doc_path)
+        # route -> serialized per-route OpenAPI subset, derived from api_documentation
+        self._api_doc_cache = {}
+        # The API prompts are fixed for the handler's lifetime
+        self._api_sys_template = prompt_config['API_SYS']
+        self._api_user_msg = prompt_config['API_USER']
+        # Per-thread [system, user] message pair reused by request_api_tool
+        self._api_messages = threading.local()
+        # name -> (skill key, code/invocation) of the latest generation awaiting judging
+        self._unjudged = {}
+
+    def reload_api_documentation(self):
+        """Drop the shared OpenAPI cache and re-read the document from disk."""
+        _load_api_documentation.cache_clear()
+        self.api_documentation = _load_api_documentation(self.api_doc_path)
+        self._api_doc_cache.clear()
+
+    def _skill_key(self, name, description, kind, dependencies):
+        # Judged code may hard-code paths or OS-specific commands, so it is only
+        # reused for the same working directory and system version
+        payload = json.dumps(
+            [name, description.strip(), kind, dependencies,
+             self.system_version, self.environment.working_dir],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def record_success(self, name):
+        """
+        Remember the tool last composed for `name` once it has passed judging, so
+        `compose_tool` can reuse it without an LLM call. Tools that fail judging
+        are never recorded.
+        """
+        pending = self._unjudged.pop(name, None)
+        if pending is not None:
+            key, skill = pending
+            self.skill_cache.put(key, skill)
 
     @api_exception_mechanism(max_retries=3)
     def compose_tool(self, name, description, kind, dependencies, references):
-        ref_snippets = json.dumps(references)
+        skill_key = self._skill_key(name, description, kind, dependencies)
+        known = self.skill_cache.get(skill_key)
+        if known is not None:
+            return known["code"], known["invoke"]
+
         if kind == 'Python':
-            sys_msg = self.prompt_config['PYTHON_SYS_GEN']
-            user_msg = self.prompt_config['PYTHON_USER_GEN'].format(
+            result = self._chat(
+                'PYTHON_SYS_GEN', 'PYTHON_USER_GEN',
                 system_version=self.system_version,
                 task_description=description,
                 working_dir=self.environment.working_dir,
                 task_name=name,
                 pre_tasks_info=dependencies,
-                relevant_code=ref_snippets
+                relevant_code=json.dumps(references)
             )
         else:
-            sys_msg = self.prompt_config['SHELL_SYS_GEN']
-            user_msg = self.prompt_config['SHELL_USER_GEN'].format(
+            result = self._chat(
+                'SHELL_SYS_GEN', 'SHELL_USER_GEN',
                 system_version=self.system_version,
                 task_description=description,
                 working_dir=self.environment.working_dir,
@@ -44,15 +116,14 @@ class TaskHandler(BaseModule):
                 pre_tasks_info=dependencies,
                 Type=kind
             )
-        result = send_chat_prompts(sys_msg, user_msg, self.llm)
         executable = self._extract_code(result, kind)
-        activation = self._extract_tagged_content(result, '<invoke>', '</invoke>')[0] if kind == 'Python' else ''
+        activation = self._first_tagged(result, '<invoke>', '</invoke>') if kind == 'Python' else ''
+        self._unjudged[name] = (skill_key, {"code": executable, "invoke": activation})
         return executable, activation
 
     def activate_tool(self, script, trigger, mode):
         if mode == 'Python':
-            append_code = '\nprint("<return>")\nprint(result)\nprint("</return>")'
-            script += f"\nresult={trigger}" + append_code
+            script += _RESULT_WRAPPER.format(invoke=trigger)
 
         print("<code_output>\n" + script + "\n</code_output>")
         outcome = self.environment.step(mode, script)
@@ -61,19 +132,17 @@ class TaskHandler(BaseModule):
 
     @api_exception_mechanism(max_retries=3)
     def assess_tool(self, script, summary, state, next_plan):
-        plan_json = json.dumps(next_plan)
-        sys_msg = self.prompt_config['JUDGE_SYS']
-        user_msg = self.prompt_config['JUDGE_USER'].format(
+        reply = self._chat(
+            'JUDGE_SYS', 'JUDGE_USER', json_mode=True,
             current_code=script,
             task=summary,
             code_output=state.result[:999] if len(state.result) > 1000 else state.result,
             current_working_dir=state.pwd,
             working_dir=self.environment.working_dir,
             files_and_folders=state.ls,
-            next_action=plan_json,
+            next_action=json.dumps(next_plan),
             code_error=state.error,
         )
-        reply = send_chat_prompts(sys_msg, user_msg, self.llm)
         parsed = self._parse_json(reply)
         return parsed['reasoning'], parsed['status'], parsed['score']
 
@@ -81,8 +150,8 @@ class TaskHandler(BaseModule):
     def revise_tool(self, source_code, summary, kind, state, feedback, dependencies):
         key = 'PYTHON_SYS_FIX' if kind == 'Python' else 'SHELL_SYS_FIX'
         val = 'PYTHON_USER_FIX' if kind == 'Python' else 'SHELL_USER_FIX'
-        sys_msg = self.prompt_config[key]
-        user_msg = self.prompt_config[val].format(
+        response = self._chat(
+            key, val,
             original_code=source_code,
             task=summary,
             error=state.error,
@@ -93,15 +162,14 @@ class TaskHandler(BaseModule):
             critique=feedback,
             pre_tasks_info=dependencies
         )
-        response = send_chat_prompts(sys_msg, user_msg, self.llm)
         revised = self._extract_python_code(response)
-        activation = self._extract_tagged_content(response, '<invoke>', '</invoke>')[0]
+        activation = self._first_tagged(response, '<invoke>', '</invoke>')
         return revised, activation
 
     @api_exception_mechanism(max_retries=3)
     def inspect_tool(self, script, summary, state):
-        sys_msg = self.prompt_config['ERR_SYS']
-        user_msg = self.prompt_config['ERR_USER'].format(
+        outcome = self._chat(
+            'ERR_SYS', 'ERR_USER', json_mode=True,
             current_code=script,
             task=summary,
             code_error=state.error,
@@ -109,7 +177,6 @@ class TaskHandler(BaseModule):
             working_dir=self.environment.working_dir,
             files_and_folders=state.ls
         )
-        outcome = send_chat_prompts(sys_msg, user_msg, self.llm)
         analysis = self._parse_json(outcome)
         return analysis['reasoning'], analysis['type']
 
@@ -123,22 +190,48 @@ class TaskHandler(BaseModule):
 
     @api_exception_mechanism(max_retries=3)
     def request_api_tool(self, description, endpoint, context="No context provided."):
-        sys_msg = self.prompt_config['API_SYS'].format(
-            openapi_doc=json.dumps(self._filter_openapi(endpoint)),
+        sys_msg = render_template(
+            self._api_sys_template,
+            openapi_doc=self._openapi_json(endpoint),
             tool_sub_task=description,
             context=context
         )
-        user_msg = self.prompt_config['API_USER']
-        response = send_chat_prompts(sys_msg, user_msg, self.llm)
+        response = self.llm.chat(self._api_conversation(sys_msg))
         return self._extract_python_code(response)
 
+    def _api_conversation(self, sys_msg):
+        """
+        Return this thread's reusable API message list with the system prompt set.
+        Only the system content changes between calls, so the dicts are kept.
+        """
+        messages = getattr(self._api_messages, 'value', None)
+        if messages is None:
+            messages = [
+                {"role": "system", "content": ""},
+                {"role": "user", "content": self._api_user_msg},
+            ]
+            self._api_messages.value = messages
+        messages[0]["content"] = sys_msg
+        return messages
+
     def qa_tool(self, background, inquiry, prior_q=None):
-        sys_msg = self.prompt_config['QA_SYS']
-        user_msg = self.prompt_config['QA_USER'].format(
+        return self._chat(
+            'QA_SYS', 'QA_USER',
             context=background,
             question=inquiry,
             current_question=prior_q
         )
+
+    def _chat(self, sys_key, user_key, json_mode=False, **fields):
+        """
+        Fills the `user_key` template with `fields` and sends it after the
+        `sys_key` system prompt, so every prompt pair goes through one place.
+        With `json_mode` the model is asked for a bare JSON object.
+        """
+        sys_msg = self.prompt_config[sys_key]
+        user_msg = render_template(self.prompt_config[user_key], **fields)
+        if json_mode:
+            return send_chat_prompts(sys_msg, user_msg, self.llm, response_format={"type": "json_object"})
         return send_chat_prompts(sys_msg, user_msg, self.llm)
 
     def _extract_code(self, text, lang):
@@ -153,10 +246,14 @@ class TaskHandler(BaseModule):
         return self._extract_code(text, 'python')
 
     def _parse_json(self, content):
-        return json.loads(re.search(r'{.*}', content, re.DOTALL).group())
+        try:
+            return json.loads(content)
+        except ValueError:
+            # Backends without JSON mode may still wrap the object in prose or fences
+            return json.loads(_JSON_OBJECT_RE.search(content).group())
 
     def _extract_summary(self, snippet):
-        match = re.search(r'"""\s*\n\s*(.*?)[\.\n]', snippet)
+        match = _SUMMARY_RE.search(snippet)
         if not match:
             raise NotImplementedError("Summary missing.")
         return match.group(1)
@@ -169,44 +266,63 @@ class TaskHandler(BaseModule):
         }
 
     def _extract_tagged_content(self, msg, start, end):
-        return re.findall(f'{start}(.*?){end}', msg, re.DOTALL)
+        return tagged_pattern(start, end).findall(msg)
+
+    def _first_tagged(self, msg, start, end):
+        # Same as _extract_tagged_content(...)[0], but stops at the first block
+        begin = msg.find(start)
+        stop = msg.find(end, begin + len(start)) if begin != -1 else -1
+        if stop == -1:
+            raise IndexError(f"No {start}...{end} block in response.")
+        return msg[begin + len(start):stop]
 
     def store_text(self, data, location):
         Path(location).parent.mkdir(parents=True, exist_ok=True)
-        with open(location, 'w', encoding='utf-8') as f:
-            sanitized = '\n'.join(line.strip() for line in data.strip().splitlines())
-            f.write(sanitized)
+        with open(location, 'w', encoding='utf-8', buffering=1 << 17) as f:
+            f.write(data.strip().replace('\r\n', '\n'))
 
     def extract_path(self, input_str):
-        unix = r"/[^/\s]+(?:/[^/\s]*)*"
-        windows = r"[a-zA-Z]:\\(?:[^\\/\s]+\\)*[^\\/\s]+"
-        combined = f"({unix})|({windows})"
-        found = re.findall(combined, input_str)
+        found = _PATH_RE.findall(input_str)
         paths = [i[0] or i[1] for i in found]
         return paths[0].strip('"\'') if paths else ''
 
+    def _openapi_json(self, route):
+        if route not in self._api_doc_cache:
+            doc = self._filter_openapi(route)
+            # Cached per route, so the stdlib's cost is paid once; its output is the prompt
+            # text (and cache key input) whether or not orjson is installed
+            self._api_doc_cache[route] = json.dumps(doc)
+        return self._api_doc_cache[route]
+
     def _filter_openapi(self, route):
-        if route not in self.api_documentation['paths']:
+        try:
+            path_doc = self.api_documentation['paths'][route]
+        except KeyError:
             return {"error": "Unknown endpoint."}
 
         minimal_doc = {
             "openapi": self.api_documentation['openapi'],
             "info": self.api_documentation['info'],
-            "paths": {route: self.api_documentation['paths'][route]},
+            "paths": {route: path_doc},
             "components": {"schemas": {}}
         }
 
-        verb_data = self.api_documentation['paths'][route].get('get') or \
-                    self.api_documentation['paths'][route].get('post', {})
+        verb_data = path_doc.get('get') or path_doc.get('post', {})
 
-        ref = verb_data.get('requestBody', {}).get('content', {}).get('application/json', {}).get('schema', {}).get('$ref')
-        if not ref:
-            allof = verb_data.get('requestBody', {}).get('content', {}).get('multipart/form-data', {}).get('schema', {}).get('allOf', [])
-            if allof and '$ref' in allof[0]:
-                ref = allof[0]['$ref']
+        try:
+            content = verb_data['requestBody']['content']
+        except KeyError:
+            content = {}
+        try:
+            ref = content['application/json']['schema']['$ref']
+        except KeyError:
+            try:
+                ref = content['multipart/form-data']['schema']['allOf'][0]['$ref']
+            except (KeyError, IndexError):
+                ref = None
 
         if ref:
-            key = ref.split('/')[-1]
+            _, _, key = ref.rpartition('/')
             minimal_doc['components']['schemas'][key] = self.api_documentation['components']['schemas'][key]
 
         return minimal_doc
@@ -58,7 +58,7 @@ class TaskOrchestrator(BaseModule):
         task_obj = self.tool_node[target_task]
         task_details = task_obj.description
         serialized_tools = json.dumps(tool_info_map)
-        directory_listing = self.environment.list_working_dir()
+        directory_listing = self.environment.list_working_dir_cached()
 
         sys_prompt = self.config['_SYSTEM_TASK_REPLAN_PROMPT']
         user_prompt = self.config['_USER_TASK_REPLAN_PROMPT'].format(
@@ -87,16 +87,16 @@ class TaskOrchestrator(BaseModule):
             category (str): Tool classification type.
         """
         if outcome and category == 'Code':
-            extracted = self.extract_information(outcome, "<return>", "</return>")
+            extracted = self.extract_return_value(outcome)
             logging.info(extracted)
             print("======== Extracted Output ========")
             print(extracted)
             print("==================================")
-            if extracted != 'None':
-                self.tool_node[identifier]._return_val = extracted
+            if extracted not in (None, 'None'):
+                self.tool_node[identifier]._outcome = extracted
         if script_block:
-            self.tool_node[identifier]._relevant_code = script_block
-        self.tool_node[identifier]._status = executed
+            self.tool_node[identifier].assets['code'] = script_block
+        self.tool_node[identifier]._is_done = executed
 
     def fetch_tool_catalog(self, filter_list=None):
         """
@@ -150,7 +150,7 @@ class TaskOrchestrator(BaseModule):
             self.tool_graph[node_name] = node_links
             for upstream in node_links:
                 self.tool_node[upstream].next_action[node_name] = node_desc
-        last_key = list(tool_payload.keys())[-1]
+        last_key = next(reversed(tool_payload))
         self.tool_graph[anchor_task].append(last_key)
 
     def summarize_dependencies(self, focus_task):
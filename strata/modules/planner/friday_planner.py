@@ -1,26 +1,39 @@
 from strata.tool_repository.manager.action_node import ActionNode
 from collections import defaultdict, deque
+from functools import lru_cache
+from graphlib import CycleError
 from strata.modules.base_module import BaseModule
+from strata.utils.plan_cache import PlanCache
 from strata.tool_repository.manager.tool_manager import get_open_api_description_pair
-from strata.utils.utils import send_chat_prompts, api_exception_mechanism
+from strata.utils.utils import send_chat_prompts, api_exception_mechanism, render_template
 import json
 import sys
 import logging
 
 
+@lru_cache(maxsize=1)
+def _open_api_catalog():
+    """The OpenAPI tool list only changes with the server spec, so build it once per process."""
+    return get_open_api_description_pair()
+
+
 class HelixPlanner(BaseModule):
     """
     The HelixPlanner orchestrates high-level task breakdown, adaptation,
     and dependency resolution across a directed toolchain workflow.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, plan_cache=None):
         super().__init__()
         self.task_total = 0
         self.node_map = {}
         self.config = config
         self.dependency_graph = defaultdict(list)
         self.execution_queue = []
+        self.plan_cache = plan_cache if plan_cache is not None else PlanCache()
+        self._tool_list_cache = {}
+        self._tool_list_version = None
+        self._raw_outputs = {}
 
     def clear_state(self):
         """
@@ -30,39 +43,57 @@ class HelixPlanner(BaseModule):
         self.node_map.clear()
         self.dependency_graph.clear()
         self.execution_queue.clear()
+        self._raw_outputs.clear()
 
     @api_exception_mechanism(max_retries=3)
-    def break_down_goal(self, goal, tool_catalog):
+    def break_down_goal(self, goal, tool_catalog=None):
         """
         Breaks a user objective into discrete actionable components.
 
         Args:
             goal (str): The high-level objective to deconstruct.
-            tool_catalog (dict): Tool name-description mapping.
+            tool_catalog (dict | str, optional): Tool name-description mapping, or its
+                JSON serialization if the caller already has one. When omitted, only
+                the tools most similar to `goal` are offered (see `shortlist_tools`).
 
         Side Effects:
-            Updates internal dependency graph and reorders tasks.
-        """
-        tool_data = json.dumps(tool_catalog)
-        fs_snapshot = self.environment.list_working_dir()
-        external_apis = get_open_api_description_pair()
-
-        sys_prompt = self.config['_SYSTEM_TASK_DECOMPOSE_PROMPT']
-        user_prompt = self.config['_USER_TASK_DECOMPOSE_PROMPT'].format(
-            system_version=self.system_version,
-            task=goal,
-            tool_list=tool_data,
-            api_list=external_apis,
-            working_dir=self.environment.working_dir,
-            files_and_folders=fs_snapshot
-        )
+            Updates internal dependency graph and reorders tasks. Plans for
+            previously seen inputs are served from `plan_cache` without an LLM call.
+        """
+        if tool_catalog is None:
+            tool_data = self.shortlist_tools(goal)
+        elif isinstance(tool_catalog, str):
+            tool_data = tool_catalog
+        else:
+            tool_data = json.dumps(tool_catalog)
+        fs_snapshot = self.environment.list_working_dir_cached()
+        external_apis = _open_api_catalog()
 
-        result = send_chat_prompts(sys_prompt, user_prompt, self.llm, prefix="Overall")
+        cache_key = self.plan_cache.make_key(
+            goal, tool_data, external_apis, self.environment.working_dir,
+            fs_snapshot, self.system_version
+        )
+        cached_plan = self.plan_cache.get(cache_key)
+        if cached_plan is not None:
+            self._load_plan(cached_plan)
+            return
+
+        result = self._send_split_prompt(
+            'TASK_DECOMPOSE',
+            static_fields=dict(
+                system_version=self.system_version,
+                tool_list=tool_data,
+                api_list=external_apis,
+                working_dir=self.environment.working_dir
+            ),
+            dynamic_fields=dict(task=goal, files_and_folders=fs_snapshot),
+            prefix="Overall"
+        )
         parsed_data = self.extract_json_from_string(result)
 
         if parsed_data != 'No JSON data found in the string.':
-            self._build_graph(parsed_data)
-            self._resolve_order()
+            self._load_plan(parsed_data)
+            self.plan_cache.put(cache_key, parsed_data)
         else:
             print(result)
             print('No structured data retrieved.')
@@ -75,31 +106,65 @@ class HelixPlanner(BaseModule):
         Args:
             reason (str): Motivation or explanation for adjustment.
             active_task (str): Name of the node being reassessed.
-            tools_meta (dict): Tool name-description JSON payload.
+            tools_meta (dict | str): Tool name-description mapping or its JSON.
 
         Side Effects:
             Integrates new nodes and triggers reordering of tasks.
         """
         ref_node = self.node_map[active_task]
-        serialized_tools = json.dumps(tools_meta)
-        dir_snapshot = self.environment.list_working_dir()
-
-        sys_prompt = self.config['_SYSTEM_TASK_REPLAN_PROMPT']
-        user_prompt = self.config['_USER_TASK_REPLAN_PROMPT'].format(
-            current_task=active_task,
-            current_task_description=ref_node.description,
-            system_version=self.system_version,
-            reasoning=reason,
-            tool_list=serialized_tools,
-            working_dir=self.environment.working_dir,
-            files_and_folders=dir_snapshot
+        serialized_tools = tools_meta if isinstance(tools_meta, str) else json.dumps(tools_meta)
+        dir_snapshot = self.environment.list_working_dir_cached()
+
+        feedback = self._send_split_prompt(
+            'TASK_REPLAN',
+            static_fields=dict(
+                system_version=self.system_version,
+                tool_list=serialized_tools,
+                working_dir=self.environment.working_dir
+            ),
+            dynamic_fields=dict(
+                current_task=active_task,
+                current_task_description=ref_node.description,
+                reasoning=reason,
+                files_and_folders=dir_snapshot
+            )
         )
-
-        feedback = send_chat_prompts(sys_prompt, user_prompt, self.llm)
         patch_nodes = self.extract_json_from_string(feedback)
 
         self._insert_task_node(patch_nodes, active_task)
-        self._resolve_order()
+        if not self._splice_patch(patch_nodes, active_task):
+            self._resolve_order()
+
+    def _send_split_prompt(self, stem, static_fields, dynamic_fields, prefix=""):
+        """
+        Send a planning prompt with its stable context ahead of the volatile fields.
+
+        The system prompt and the `_STATIC_<stem>_PROMPT` block (tool list, system
+        version, ...) form an unchanging prefix that provider-side prompt caching can
+        reuse; task-specific data goes last in `_DYNAMIC_<stem>_PROMPT`. Prompt sets
+        without the split fall back to the single `_USER_<stem>_PROMPT` message.
+
+        Args:
+            stem (str): Prompt family, e.g. 'TASK_DECOMPOSE'.
+            static_fields (dict): Values that rarely change between calls.
+            dynamic_fields (dict): Values specific to this call.
+            prefix (str): Logging prefix forwarded to the LLM client.
+
+        Returns:
+            str: The model response.
+        """
+        sys_prompt = self.config[f'_SYSTEM_{stem}_PROMPT']
+        static_key, dynamic_key = f'_STATIC_{stem}_PROMPT', f'_DYNAMIC_{stem}_PROMPT'
+        if static_key not in self.config or dynamic_key not in self.config:
+            user_prompt = render_template(self.config[f'_USER_{stem}_PROMPT'], **static_fields, **dynamic_fields)
+            return send_chat_prompts(sys_prompt, user_prompt, self.llm, prefix=prefix)
+
+        messages = [
+            {"role": "system", "content": sys_prompt},
+            {"role": "user", "content": render_template(self.config[static_key], **static_fields)},
+            {"role": "user", "content": render_template(self.config[dynamic_key], **dynamic_fields)},
+        ]
+        return self.llm.chat(messages, prefix=prefix)
 
     def patch_tool_info(self, node_id, output='', code=None, done=False, category='Code'):
         """
@@ -111,20 +176,25 @@ class HelixPlanner(BaseModule):
             code (str): Related script fragment.
             done (bool): Execution status.
             category (str): Classification of node type.
+
+        Repair loops often resubmit the same output and code; those are detected
+        by equality and not re-extracted or reassigned.
         """
-        if output and category == 'Code':
-            output = self.extract_information(output, "<return>", "</return>")
+        node = self.node_map[node_id]
+        if output and category == 'Code' and self._raw_outputs.get(node_id) != output:
+            self._raw_outputs[node_id] = output
+            output = self.extract_return_value(output)
             logging.info(output)
             print("======= Extracted Output =======")
             print(output)
             print("================================")
-            if output != 'None':
-                self.node_map[node_id]._return_val = output
+            if output not in (None, 'None'):
+                node._outcome = output
 
-        if code:
-            self.node_map[node_id]._relevant_code = code
+        if code and code != node.assets.get('code'):
+            node.assets['code'] = code
 
-        self.node_map[node_id]._status = done
+        node._is_done = done
 
     def retrieve_available_tools(self, filter_set=None):
         """
@@ -135,13 +205,44 @@ class HelixPlanner(BaseModule):
 
         Returns:
             str: JSON object of tools.
+
+        The serialized result is memoized per filter until the tool registry's
+        `version` changes.
         """
+        if self._tool_list_version != self.tool_manager.version:
+            self._tool_list_cache.clear()
+            self._tool_list_version = self.tool_manager.version
+
+        cache_key = frozenset(filter_set) if filter_set else None
+        if cache_key in self._tool_list_cache:
+            return self._tool_list_cache[cache_key]
+
         full_set = self.tool_manager.descriptions
-        if not filter_set:
-            return json.dumps(full_set)
+        if cache_key is None:
+            serialized = json.dumps(full_set)
+        else:
+            serialized = json.dumps({k: v for k, v in full_set.items() if k in cache_key})
+        self._tool_list_cache[cache_key] = serialized
+        return serialized
+
+    def shortlist_tools(self, goal, top_k=20):
+        """
+        Outputs JSON descriptions for only the tools most relevant to a goal.
+
+        Keeps the planning prompt proportional to `top_k` rather than to the size
+        of the whole tool library.
+
+        Args:
+            goal (str): Objective used as the similarity query.
+            top_k (int): Maximum number of tools to include.
 
-        subset = {k: v for k, v in full_set.items() if k in filter_set}
-        return json.dumps(subset)
+        Returns:
+            str: JSON object of the shortlisted tools.
+        """
+        names = self.tool_manager.query_names(goal, top_k)
+        if not names:
+            return json.dumps({})
+        return self.retrieve_available_tools(names)
 
     def _build_graph(self, structure):
         """
@@ -157,6 +258,25 @@ class HelixPlanner(BaseModule):
             for dep in props['dependencies']:
                 self.node_map[dep].next_action[label] = props['description']
 
+    def _load_plan(self, structure):
+        """
+        Replaces the current graph with `structure` and orders it.
+
+        Args:
+            structure (dict): JSON describing tool chain.
+
+        Raises:
+            CycleError: If the plan is cyclic. The graph is cleared on this and
+                any other failure, so a retry of `break_down_goal` starts empty.
+        """
+        self.clear_state()
+        try:
+            self._build_graph(structure)
+            self._resolve_order()
+        except Exception:
+            self.clear_state()
+            raise
+
     def _insert_task_node(self, patch_data, parent_task):
         """
         Adds a node and links it to an existing task chain.
@@ -171,44 +291,100 @@ class HelixPlanner(BaseModule):
             self.dependency_graph[label] = content['dependencies']
             for d in content['dependencies']:
                 self.node_map[d].next_action[label] = content['description']
-        final_label = list(patch_data.keys())[-1]
+        final_label = next(reversed(patch_data))
         self.dependency_graph[parent_task].append(final_label)
 
+    def _splice_patch(self, patch_data, parent_task):
+        """
+        Schedules freshly inserted nodes without re-sorting the whole graph.
+
+        A replan only adds `patch_data` in front of `parent_task`, so when every
+        outside dependency of the patch and of `parent_task` has already run, the
+        patch (sorted among itself) followed by `parent_task` can be put at the head
+        of the queue and the rest of the existing order stays valid.
+
+        Args:
+            patch_data (dict): Nodes added by the replan.
+            parent_task (str): Task the patch was attached to.
+
+        Returns:
+            bool: False if the patch touches unfinished nodes elsewhere in the graph
+            and a full `_resolve_order` pass is needed instead.
+        """
+        local_deg = {label: 0 for label in patch_data}
+        children = defaultdict(list)
+        for label in patch_data:
+            for dep in self.dependency_graph[label]:
+                if dep in local_deg:
+                    local_deg[label] += 1
+                    children[dep].append(label)
+                elif not self.node_map[dep].status:
+                    return False
+        for dep in self.dependency_graph[parent_task]:
+            if dep not in local_deg and not self.node_map[dep].status:
+                return False
+
+        order = []
+        q = deque(label for label, deg in local_deg.items() if deg == 0)
+        while q:
+            curr = q.popleft()
+            order.append(curr)
+            for nxt in children[curr]:
+                local_deg[nxt] -= 1
+                if local_deg[nxt] == 0:
+                    q.append(nxt)
+        if len(order) != len(local_deg):
+            return False
+
+        if parent_task in self.execution_queue:
+            self.execution_queue.remove(parent_task)
+        self.execution_queue[:0] = order + [parent_task]
+        return True
+
     def _resolve_order(self):
         """
         Performs topological sorting of tasks with dependency constraints.
 
+        Runs over the whole graph; replans go through `_splice_patch` first and
+        only fall back to this when the patch cannot be scheduled locally.
+
         Side Effects:
             Updates `execution_queue` with sorted task sequence.
+
+        Raises:
+            CycleError: If the pending tasks contain a dependency cycle. The queue
+                is left empty rather than holding a partial order.
         """
         self.execution_queue.clear()
-        dag = defaultdict(list)
+        # Dependents and in-degrees of the unfinished tasks, built in one sweep
+        children = {}
+        in_deg = {}
 
         for node, parents in self.dependency_graph.items():
-            if not self.node_map[node].status:
-                dag.setdefault(node, [])
-                for p in parents:
-                    if not self.node_map[p].status:
-                        dag[p].append(node)
-
-        in_deg = {n: 0 for n in dag}
-        for n in dag:
-            for ch in dag[n]:
-                in_deg[ch] += 1
+            if self.node_map[node].status:
+                continue
+            children.setdefault(node, [])
+            in_deg.setdefault(node, 0)
+            for p in parents:
+                if not self.node_map[p].status:
+                    children.setdefault(p, []).append(node)
+                    in_deg.setdefault(p, 0)
+                    in_deg[node] += 1
 
         q = deque([n for n, deg in in_deg.items() if deg == 0])
         while q:
             curr = q.popleft()
             self.execution_queue.append(curr)
-            for nxt in dag[curr]:
+            for nxt in children[curr]:
                 in_deg[nxt] -= 1
                 if in_deg[nxt] == 0:
                     q.append(nxt)
 
-        if len(self.execution_queue) == len(dag):
-            print("Topological ordering established.")
-        else:
-            return "Cycle detected: sort failed."
+        if len(self.execution_queue) != len(in_deg):
+            self.execution_queue.clear()
+            stuck = [n for n, deg in in_deg.items() if deg > 0]
+            raise CycleError("Cycle detected in task graph", stuck)
+        print("Topological ordering established.")
 
     def summarize_dependencies(self, task_id):
         """
@@ -1,5 +1,6 @@
 from strata.modules.base_module import BaseModule
 from strata.utils.utils import send_chat_prompts
+from collections import OrderedDict
 import json
 
 
@@ -10,10 +11,14 @@ class FridayRetriever(BaseModule):
     tools based on tasks or queries.
     """
 
-    def __init__(self, prompt, tool_manager):
+    def __init__(self, prompt, tool_manager, name_cache_size=512):
         super().__init__()
         self.prompt = prompt
         self.tool_manager = tool_manager
+        # LRU of normalized task text -> tool names, valid for one registry version
+        self._name_cache = OrderedDict()
+        self._name_cache_size = name_cache_size
+        self._name_cache_version = None
 
     def delete_tool(self, tool_name):
         """
@@ -24,6 +29,7 @@ class FridayRetriever(BaseModule):
         """
         try:
             self.tool_manager.delete_tool(tool_name)
+            self._name_cache.clear()
         except Exception as e:
             raise RuntimeError(f"Failed to delete tool '{tool_name}': {e}")
 
@@ -31,6 +37,9 @@ class FridayRetriever(BaseModule):
         """
         Retrieve the top-k tool names relevant to the given task.
 
+        Repeated queries (compared after trimming and lowercasing) are answered
+        from an LRU cache until the tool library changes.
+
         Args:
             task (str): Task description.
             k (int): Number of top tools to return. Default is 10.
@@ -38,11 +47,25 @@ class FridayRetriever(BaseModule):
         Returns:
             list[str]: List of relevant tool names.
         """
+        if self._name_cache_version != self.tool_manager.version:
+            self._name_cache.clear()
+            self._name_cache_version = self.tool_manager.version
+
+        key = (task.strip().lower(), k)
+        if key in self._name_cache:
+            self._name_cache.move_to_end(key)
+            return list(self._name_cache[key])
+
         try:
-            return self.tool_manager.retrieve_tool_name(task, k)
+            names = self.tool_manager.retrieve_tool_name(task, k)
         except Exception as e:
             raise RuntimeError(f"Tool name retrieval failed for task '{task}': {e}")
 
+        self._name_cache[key] = list(names)
+        if len(self._name_cache) > self._name_cache_size:
+            self._name_cache.popitem(last=False)
+        return names
+
     def retrieve_tool_code(self, tool_name):
         """
         Retrieve the source code of a specific tool.
@@ -83,10 +106,7 @@ class FridayRetriever(BaseModule):
         Returns:
             dict[str, str]: Dictionary mapping tool names to their code.
         """
-        code_pair = {}
-        for name in tool_names:
-            code_pair[name] = self.retrieve_tool_code(name)
-        return code_pair
+        return {name: self.retrieve_tool_code(name) for name in tool_names}
 
     def retrieve_tool_description_pair(self, tool_names):
         """
@@ -98,10 +118,7 @@ class FridayRetriever(BaseModule):
         Returns:
             dict[str, str]: Dictionary mapping tool names to their descriptions.
         """
-        desc_pair = {}
-        for name in tool_names:
-            desc_pair[name] = self.retrieve_tool_description(name)
-        return desc_pair
+        return {name: self.retrieve_tool_description(name) for name in tool_names}
 
     def tool_code_filter(self, tool_code_pair, task):
         """
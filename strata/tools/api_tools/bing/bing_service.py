@@ -3,20 +3,19 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from .bing_api_v2 import SmartWebSearchAgent
 from .image_search_api import VisualSearchService
-import tiktoken
 import os
-from dotenv import load_dotenv
+from strata.utils.env_bootstrap import ensure as ensure_env
+from strata.utils.utils import count_tokens
 
-load_dotenv(dotenv_path='.env', override=True)
+ensure_env()
 
 # Load API credential for external services
 BING_KEY = os.getenv("BING_SUBSCRIPTION_KEY")
 
-# Token size checker for adaptive model use
+
 def estimate_token_count(text: str) -> int:
-    """Estimate token usage in input string."""
-    tokenizer = tiktoken.encoding_for_model("gpt-4-1106-preview")
-    return len(tokenizer.encode(text))
+    """Estimate token usage in input string; the encoder loads on first call."""
+    return count_tokens(text, "gpt-4-1106-preview")
 
 router = APIRouter()
 
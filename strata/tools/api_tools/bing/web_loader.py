@@ -13,16 +13,20 @@ except ImportError:
     ) from None
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_REPEATED_SYMBOL_RE = re.compile(r"([^\w\s])\1*")
+
+
 def sanitize_text(raw_text: str) -> str:
     """
     Apply multi-step cleansing to textual content.
     """
     # Flatten newlines and reduce spacing
     cleaned = raw_text.replace("\n", " ")
-    cleaned = re.sub(r"\s+", " ", cleaned.strip())
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned.strip())
     cleaned = cleaned.replace("\\", "")
     cleaned = cleaned.replace("#", " ")
-    cleaned = re.sub(r"([^\w\s])\1*", r"\1", cleaned)
+    cleaned = _REPEATED_SYMBOL_RE.sub(r"\1", cleaned)
     return cleaned
 
 
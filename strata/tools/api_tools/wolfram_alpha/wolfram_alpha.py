@@ -3,10 +3,10 @@ from pydantic import BaseModel
 from typing import Optional
 import wolframalpha
 import os
-from dotenv import load_dotenv
+from strata.utils.env_bootstrap import ensure as ensure_env
 
 # Load API credentials
-load_dotenv(dotenv_path=".env", override=True)
+ensure_env()
 _WOLFRAM_KEY = os.getenv("WOLFRAMALPHA_APP_ID")
 
 router = APIRouter()
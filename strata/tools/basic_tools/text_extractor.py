@@ -36,9 +36,8 @@ class ContentFetcher:
         self._executor.run(constructed_query)
 
         # Extract the result from the most recently completed task node
-        executed_nodes = list(self._executor.planner.tool_node.values())
-        if not executed_nodes:
+        try:
+            latest_result = next(reversed(self._executor.planner.tool_node.values()))
+        except StopIteration:
             return ""
-
-        latest_result = executed_nodes[-1]
         return getattr(latest_result, 'return_val', '')
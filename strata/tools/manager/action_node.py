@@ -13,6 +13,15 @@ class WorkflowUnit:
         _category (str): Classifier for the kind of operation this represents.
     """
 
+    # Planners hold one unit per step; slots drop the per-instance __dict__
+    __slots__ = (
+        "_label", "_info", "_outcome", "_related_assets",
+        "_chained_units", "_is_done", "_category",
+    )
+
+    # Labels printed by __str__, in slot order
+    _FIELDS = ("label", "info", "outcome", "assets", "chain", "is_done", "category")
+
     def __init__(self, label: str, info: str, category: str):
         """
         Instantiate a process unit with descriptor, classification, and identifier.
@@ -25,8 +34,9 @@ class WorkflowUnit:
         self._label = label
         self._info = info
         self._outcome = ""
-        self._related_assets = {}
-        self._chained_units = {}
+        # Created on first access; leaf units never need them
+        self._related_assets = None
+        self._chained_units = None
         self._is_done = False
         self._category = category
 
@@ -48,6 +58,8 @@ class WorkflowUnit:
     @property
     def assets(self) -> dict:
         """Grabs supporting data or reference entries."""
+        if self._related_assets is None:
+            self._related_assets = {}
         return self._related_assets
 
     @property
@@ -63,22 +75,48 @@ class WorkflowUnit:
     @property
     def chain(self) -> dict:
         """Lists the subsequent units that follow this one."""
+        if self._chained_units is None:
+            self._chained_units = {}
         return self._chained_units
 
+    # Names the planners and agents still read; each maps onto a slot-backed view
+    @property
+    def description(self) -> str:
+        """Alias of `info`."""
+        return self.info
+
+    @property
+    def node_type(self) -> str:
+        """Alias of `category`."""
+        return self._category
+
+    @property
+    def return_val(self) -> str:
+        """Alias of `outcome`."""
+        return self._outcome
+
+    @property
+    def status(self) -> bool:
+        """Alias of `is_done`."""
+        return self._is_done
+
+    @property
+    def next_action(self) -> dict:
+        """Alias of `chain`."""
+        return self.chain
+
     def __str__(self) -> str:
         """
         Returns a readable dump of the unit's attributes.
+
+        Reads the slots directly, so printing a leaf unit does not create its
+        lazy `assets`/`chain` dicts.
         """
-        return (
-            f"label: {self.label}\n"
-            f"info: {self.info}\n"
-            f"outcome: {self.outcome}\n"
-            f"assets: {self._related_assets}\n"
-            f"chain: {self.chain}\n"
-            f"is_done: {self.is_done}\n"
-            f"category: {self.category}"
+        values = (
+            self._label, self._info, self._outcome, self._related_assets or {},
+            self._chained_units or {}, self._is_done, self._category,
         )
-
+        return "\n".join(f"{name}: {value}" for name, value in zip(self._FIELDS, values))
 
 if __name__ == "__main__":
     test_unit = WorkflowUnit("sample_step", "Does something generic", "Routine")
@@ -1,21 +1,75 @@
 import os
-import dotenv
+import importlib
+import logging
+import logging.handlers
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from strata.utils.env_bootstrap import ensure as ensure_env
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from strata.utils.server_config import ConfigManager as CfgMgr
-dotenv.load_dotenv(dotenv_path=".env", override=True)
+ensure_env()
 
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
+# Routing table for available plugins. Only the active ones are imported, since
+# several of them load models as an import side effect.
+plugin_routes = {
+    "web_search": "strata.tool_repository.api_tools.bing.bing_service",
+    "speech_to_text": "strata.tool_repository.api_tools.audio2text.audio2text_service",
+    "caption_gen": "strata.tool_repository.api_tools.image_caption.image_caption_service",
+    "math_solver": "strata.tool_repository.api_tools.wolfram_alpha.wolfram_alpha",
+}
+
+# List of modules to activate
+active_modules = ["web_search", "speech_to_text", "caption_gen"]
+
+
+def _import_router(plugin):
+    """
+    Import a plugin module and return its router, or None if it is unknown.
+    """
+    module_path = plugin_routes.get(plugin)
+    if module_path is None:
+        return None
+    return importlib.import_module(module_path).router
+
+
+# Request tracing goes through a queue so that handlers never block on stdout;
+# a background listener thread, running only while the app is served, does the writes.
+logger = logging.getLogger("api_server")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Run the trace log listener for as long as the server is up.
+    """
+    listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+
+
 # Instantiate the API app
-application = FastAPI()
+application = FastAPI(lifespan=lifespan)
 
-# Plug-in imports
-from strata.tool_repository.api_tools.bing.bing_service import router as mod_bing
-from strata.tool_repository.api_tools.audio2text.audio2text_service import router as mod_audio
-from strata.tool_repository.api_tools.image_caption.image_caption_service import router as mod_imgcap
-from strata.tool_repository.api_tools.wolfram_alpha.wolfram_alpha import router as mod_math
+# Import the active plugins concurrently so that the slowest one, rather than the
+# sum of all of them, bounds startup. Routes are registered at import, so the app
+# is complete even when it is never started (OpenAPI dumps, TestClient).
+with ThreadPoolExecutor(max_workers=len(active_modules) or 1) as pool:
+    for route in pool.map(_import_router, active_modules):
+        if route:
+            application.include_router(route)
 
 
 class TrafficTracer(BaseHTTPMiddleware):
@@ -23,36 +77,24 @@ class TrafficTracer(BaseHTTPMiddleware):
     Captures inbound API activity and outbound replies, including fault cases.
     """
     async def dispatch(self, request: Request, call_next):
-        print(f"[Trace] ➡️ {request.method} {request.url}")
+        tracing = logger.isEnabledFor(logging.INFO)
+        if tracing:
+            logger.info("[Trace] ➡️ %s %s", request.method, request.url)
+        start = time.perf_counter()
         try:
             result = await call_next(request)
         except Exception as issue:
-            print(f"[Error] ❌ {issue}")
+            logger.error("[Error] ❌ %s", issue)
             raise issue from None
-        print(f"[Trace] ⬅️ Status {result.status_code}")
+        if tracing:
+            logger.info("[Trace] ⬅️ Status %d in %.2f ms",
+                        result.status_code, (time.perf_counter() - start) * 1000)
         return result
 
 
 # Wire in middleware for tracing
 application.add_middleware(TrafficTracer)
 
-# Routing table for available plugins
-plugin_routes = {
-    "web_search": mod_bing,
-    "speech_to_text": mod_audio,
-    "caption_gen": mod_imgcap,
-    "math_solver": mod_math,
-}
-
-# List of modules to activate
-active_modules = ["web_search", "speech_to_text", "caption_gen"]
-
-# Selectively register API endpoints
-for plugin in active_modules:
-    route = plugin_routes.get(plugin)
-    if route:
-        application.include_router(route)
-
 
 if __name__ == "__main__":
     import uvicorn
@@ -2,14 +2,26 @@ import os
 import json
 import re
 import sys
+import sqlite3
+import threading
+import hashlib
+import tempfile
 import argparse
-from dotenv import load_dotenv
+import numpy as np
+from functools import lru_cache
+from strata.utils.env_bootstrap import ensure as ensure_env
 
+from langchain_core.embeddings import Embeddings
 from langchain.vectorstores import Chroma
 from langchain.embeddings.openai import OpenAIEmbeddings
 from langchain_community.embeddings import OllamaEmbeddings
 
-load_dotenv(dotenv_path=".env", override=True)
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used otherwise
+    orjson = None
+
+ensure_env()
 
 API_KEY = os.getenv("OPENAI_API_KEY")
 ORG_ID = os.getenv("OPENAI_ORGANIZATION")
@@ -17,30 +29,117 @@ ORG_ID = os.getenv("OPENAI_ORGANIZATION")
 MODEL_KIND = os.getenv("EMBED_MODEL_TYPE")
 MODEL_ID = os.getenv("EMBED_MODEL_NAME")
 
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS components ("
+    "name TEXT PRIMARY KEY, code TEXT NOT NULL, description TEXT NOT NULL)"
+)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed on-disk cache in front of an embedding backend.
+
+    Each document vector is stored as `<blake2b(text)>.npy`, so re-registering a
+    tool with an unchanged description costs no provider call. Vectors live in a
+    subdirectory named after the backend class and model, so switching embedding
+    models never serves vectors of the wrong model or dimension.
+    """
+
+    def __init__(self, backend: Embeddings, cache_dir: str):
+        self._backend = backend
+        namespace = f"{type(backend).__name__}-{getattr(backend, 'model', None) or 'default'}"
+        self._cache_dir = os.path.join(cache_dir, re.sub(r"[^\w.-]", "_", namespace))
+        # Joined once; per-entry paths are a plain concatenation onto this
+        self._cache_prefix = os.path.join(self._cache_dir, "")
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    def _path(self, text: str) -> str:
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{self._cache_prefix}{key}.npy"
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        vectors = [None] * len(texts)
+        paths = [self._path(text) for text in texts]
+        missing = []
+        for i, path in enumerate(paths):
+            if os.path.exists(path):
+                vectors[i] = np.load(path).tolist()
+            else:
+                missing.append(i)
+
+        if missing:
+            fresh = self._backend.embed_documents([texts[i] for i in missing])
+            for i, vec in zip(missing, fresh):
+                self._store(paths[i], vec)
+                vectors[i] = vec
+        return vectors
+
+    def _store(self, path: str, vec: list[float]):
+        # Written beside the target and renamed into place, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(vec, dtype=np.float32))
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def embed_query(self, text: str) -> list[float]:
+        # Queries are free-form and rarely repeat, so they go straight to the backend
+        return self._backend.embed_query(text)
+
 
 class RegistryHandler:
     """
     Handles a searchable library of components. Each record includes source logic and
-    explanatory context. Descriptions are indexed via a vector database for fast retrieval.
+    explanatory context. Records live in a single SQLite file; descriptions are indexed
+    via a vector database for fast retrieval.
     """
 
-    def __init__(self, storage_base: str):
+    def __init__(self, storage_base: str, compact_vectors: bool = False):
         """
         Bootstraps the registry by loading stored data and setting up persistence layers.
 
+        A legacy component_index.json is imported into the database the first
+        time an empty registry is opened.
+
         Args:
             storage_base (str): Root folder housing records and metadata.
+            compact_vectors (bool): Hold the in-memory search vectors as float16,
+                halving their footprint for very large registries. NumPy has no BLAS
+                kernel for float16, so scoring is slower per element; leave off unless
+                memory is the constraint.
         """
         self._storage_root = storage_base
-        index_path = os.path.join(storage_base, "component_index.json")
-
-        with open(index_path, "r") as f:
-            self._records = json.load(f)
+        self._vector_dtype = np.float16 if compact_vectors else np.float32
+        self._version = 0
+        self._index_path = os.path.join(storage_base, "component_index.json")
+
+        # Usable from any thread; writes are serialized by _write_lock
+        self._db = sqlite3.connect(os.path.join(storage_base, "components.db"), check_same_thread=False)
+        self._write_lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._write_lock, self._db:
+            self._db.execute(_SCHEMA)
+        if not self._db.execute("SELECT 1 FROM components LIMIT 1").fetchone():
+            self._import_legacy_index()
+
+        # Only descriptions stay resident; code bodies are read from the database on demand
+        self._descriptions = dict(self._db.execute("SELECT name, description FROM components"))
+        self._code_lookup = lru_cache(maxsize=128)(self._select_code)
+        self._all_code = None
 
         self._vector_dir = os.path.join(storage_base, "index_vectors")
         os.makedirs(self._vector_dir, exist_ok=True)
-        os.makedirs(os.path.join(storage_base, "impl"), exist_ok=True)
-        os.makedirs(os.path.join(storage_base, "docs"), exist_ok=True)
 
         if MODEL_KIND == "OpenAI":
             embed = OpenAIEmbeddings(
@@ -50,33 +149,55 @@ class RegistryHandler:
         else:
             embed = OllamaEmbeddings(model=MODEL_ID)
 
+        self._embedder = CachedEmbeddings(embed, os.path.join(storage_base, "embed_cache"))
         self._index = Chroma(
             collection_name="component_search",
-            embedding_function=embed,
+            embedding_function=self._embedder,
             persist_directory=self._vector_dir
         )
+        # Normalized description vectors for in-process search, loaded on first query
+        self._emb = None
+        self._emb_names = []
 
-        assert self._index._collection.count() == len(self._records), \
-            "Mismatch between stored JSON records and vector entries"
+        assert self._index._collection.count() == len(self._descriptions), \
+            "Mismatch between stored records and vector entries"
 
     @property
     def all_code(self) -> str:
-        """Return all saved code blocks concatenated."""
-        return "\n\n".join(entry["code"] for entry in self._records.values())
+        """Return all saved code blocks concatenated, rebuilt only after a mutation."""
+        if self._all_code is None:
+            self._all_code = "\n\n".join(self.iter_code())
+        return self._all_code
+
+    def iter_code(self):
+        """Yield each saved code block without holding them all in memory."""
+        for (code,) in self._db.execute("SELECT code FROM components"):
+            yield code
 
     @property
     def summaries(self) -> dict:
         """Expose component names and their documented roles."""
-        return {name: rec["description"] for name, rec in self._records.items()}
+        return self._descriptions
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every mutation, for callers caching derived views."""
+        return self._version
 
     @property
     def keys(self):
         """Return all record identifiers."""
-        return self._records.keys()
+        return self._descriptions.keys()
+
+    def _select_code(self, label: str) -> str:
+        row = self._db.execute("SELECT code FROM components WHERE name = ?", (label,)).fetchone()
+        if row is None:
+            raise KeyError(label)
+        return row[0]
 
     def fetch_code(self, label: str) -> str:
         """Grab the source code for a named record."""
-        return self._records[label]["code"]
+        return self._code_lookup(label)
 
     def register(self, metadata: dict):
         """
@@ -85,38 +206,71 @@ class RegistryHandler:
         Args:
             metadata (dict): Includes 'task_name', 'code', and 'description'.
         """
-        ident = metadata["task_name"]
-        code = metadata["code"]
-        doc = metadata["description"]
+        self.register_many([metadata])
 
-        if ident in self._records:
-            self._index._collection.delete(ids=[ident])
+    def register_many(self, entries: list[dict]):
+        """
+        Insert or replace several registry entries at once.
 
-        self._index.add_texts(texts=[doc], ids=[ident], metadatas=[{"name": ident}])
-        self._records[ident] = {"code": code, "description": doc}
+        All new or changed descriptions are embedded in a single `add_texts` call,
+        the rows are written in one transaction and the vector store is persisted
+        once, instead of one round-trip per entry. Entries whose description is
+        unchanged only have their code updated and never touch the vector store.
 
-        assert self._index._collection.count() == len(self._records), \
-            "Post-update count discrepancy in index and memory store"
+        Args:
+            entries (list[dict]): Each includes 'task_name', 'code', and 'description'.
+        """
+        # Later entries win when the same name appears twice
+        batch = {item["task_name"]: (item["code"], item["description"]) for item in entries}
+        if not batch:
+            return
+
+        changed = {
+            ident: doc for ident, (_, doc) in batch.items()
+            if self._descriptions.get(ident) != doc
+        }
+        if changed:
+            replaced = [ident for ident in changed if ident in self._descriptions]
+            if replaced:
+                self._index._collection.delete(ids=replaced)
+
+            idents = list(changed)
+            self._index.add_texts(
+                texts=list(changed.values()),
+                ids=idents,
+                metadatas=[{"name": ident} for ident in idents]
+            )
+            self._descriptions.update(changed)
 
-        with open(os.path.join(self._storage_root, "impl", f"{ident}.py"), "w") as f:
-            f.write(code)
+            assert self._index._collection.count() == len(self._descriptions), \
+                "Post-update count discrepancy in index and memory store"
 
-        with open(os.path.join(self._storage_root, "docs", f"{ident}.txt"), "w") as f:
-            f.write(doc)
+            self._drop_vectors(set(replaced))
+            self._add_vectors(idents, list(changed.values()))
+        self._version += 1
 
-        with open(os.path.join(self._storage_root, "component_index.json"), "w") as f:
-            json.dump(self._records, f, indent=4)
+        with self._write_lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO components (name, code, description) VALUES (?, ?, ?)",
+                [(ident, code, doc) for ident, (code, doc) in batch.items()]
+            )
+        self._code_lookup.cache_clear()
+        self._all_code = None
 
-        self._index.persist()
+        if changed:
+            self._index.persist()
 
     def is_known(self, label: str) -> bool:
         """Check if a named entry exists."""
-        return label in self._records
+        return label in self._descriptions
 
     def query_names(self, clue: str, k: int = 10) -> list[str]:
         """
         Run a similarity search on descriptions using a natural language clue.
 
+        Ranking is a cosine similarity computed in one matrix-vector product over
+        an in-memory copy of the description vectors, rather than a Chroma query.
+
         Args:
             clue (str): Search prompt.
             k (int): Max result count.
@@ -124,38 +278,93 @@ class RegistryHandler:
         Returns:
             list[str]: Matched names.
         """
-        count = self._index._collection.count()
-        k = min(k, count)
+        if self._emb is None:
+            self._load_vectors()
+        k = min(k, len(self._emb_names))
         if k == 0:
             return []
 
-        matches = self._index.similarity_search_with_score(clue, k=k)
-        return [match.metadata["name"] for match, _ in matches]
+        query = np.asarray(self._embedder.embed_query(clue), dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = self._emb @ query.astype(self._vector_dtype)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self._emb_names[i] for i in top]
+
+    def _load_vectors(self):
+        stored = self._index._collection.get(include=["embeddings"])
+        self._emb_names = list(stored["ids"])
+        if self._emb_names:
+            self._emb = _normalize_rows(np.asarray(stored["embeddings"], dtype=np.float32)).astype(self._vector_dtype)
+        else:
+            self._emb = np.zeros((0, 0), dtype=self._vector_dtype)
+
+    def _add_vectors(self, names: list[str], texts: list[str]):
+        if self._emb is None:
+            return
+        # Served from the embedding cache filled by add_texts, so no provider call
+        vectors = _normalize_rows(np.asarray(self._embedder.embed_documents(texts), dtype=np.float32))
+        vectors = vectors.astype(self._vector_dtype)
+        self._emb = np.vstack([self._emb, vectors]) if self._emb_names else vectors
+        self._emb_names.extend(names)
+
+    def _drop_vectors(self, names: set):
+        if self._emb is None or not names:
+            return
+        keep = [i for i, name in enumerate(self._emb_names) if name not in names]
+        self._emb = self._emb[keep]
+        self._emb_names = [self._emb_names[i] for i in keep]
 
     def get_docs(self, labels: list[str]) -> list[str]:
         """Return descriptions for multiple entries."""
-        return [self._records[x]["description"] for x in labels]
+        return [self._descriptions[x] for x in labels]
 
     def get_sources(self, labels: list[str]) -> list[str]:
         """Return code for multiple entries."""
-        return [self._records[x]["code"] for x in labels]
+        return [self.fetch_code(x) for x in labels]
 
     def discard(self, label: str):
         """Fully remove a record from all storage locations."""
-        if label in self._records:
+        if label in self._descriptions:
             self._index._collection.delete(ids=[label])
+        self._version += 1
+
+        self._descriptions.pop(label, None)
+        with self._write_lock, self._db:
+            self._db.execute("DELETE FROM components WHERE name = ?", (label,))
+        self._code_lookup.cache_clear()
+        self._all_code = None
+        self._drop_vectors({label})
+
+    def _import_legacy_index(self):
+        """Copy records from a component_index.json registry into the database."""
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "rb") as f:
+            raw = f.read()
+        records = orjson.loads(raw) if orjson else json.loads(raw)
+
+        with self._write_lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO components (name, code, description) VALUES (?, ?, ?)",
+                [(name, rec["code"], rec["description"]) for name, rec in records.items()]
+            )
 
-        index_fp = os.path.join(self._storage_root, "component_index.json")
-        with open(index_fp, "r") as f:
-            data = json.load(f)
-        data.pop(label, None)
-        with open(index_fp, "w") as f:
-            json.dump(data, f, indent=4)
-
-        code_fp = os.path.join(self._storage_root, "impl", f"{label}.py")
-        if os.path.exists(code_fp):
-            os.remove(code_fp)
+    def export_json(self, path: str = None):
+        """
+        Write all records as a component_index.json-style file for external tools.
 
-        doc_fp = os.path.join(self._storage_root, "docs", f"{label}.txt")
-        if os.path.exists(doc_fp):
-            os.remove(doc_fp)
+        Args:
+            path (str, optional): Destination. Defaults to component_index.json in the storage root.
+        """
+        records = {
+            name: {"code": code, "description": doc}
+            for name, code, doc in self._db.execute("SELECT name, code, description FROM components")
+        }
+        # orjson only indents by two spaces; keep the stdlib's four either way
+        with open(path or self._index_path, "w") as f:
+            json.dump(records, f, indent=4)
+
+    def close(self):
+        """Release the database handle."""
+        self._db.close()
@@ -1,9 +1,21 @@
+import json
+import time
 import requests
 import os
-from dotenv import load_dotenv
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from strata.utils.env_bootstrap import ensure as ensure_env
 
-load_dotenv(dotenv_path=".env", override=True)
-SERVICE_ROOT = os.getenv("API_BASE_URL")
+
+@lru_cache(maxsize=1)
+def service_root() -> Optional[str]:
+    """Base URL of the tool API, read from the environment on first use."""
+    ensure_env()
+    return os.getenv("API_BASE_URL")
 
 
 class HttpAgent:
@@ -18,13 +30,57 @@ class HttpAgent:
         _base (str): Base URL used for all endpoint requests.
         _default_headers (dict): HTTP headers to send with every request.
     """
+    _singleton: Optional['HttpAgent'] = None
+    _init_lock = threading.Lock()
+    # Idempotent GET bodies are kept this long and up to this many entries
+    GET_CACHE_TTL = 3600
+    GET_CACHE_SIZE = 512
+    # (connect, read) seconds: fail fast on dead hosts, allow slow tool responses
+    TIMEOUT = (5, 30)
+
+    def __new__(cls) -> 'HttpAgent':
+        """
+        Ensures a single shared agent, and so a single connection pool, per process.
+
+        Returns:
+            HttpAgent: The globally shared instance.
+        """
+        if cls._singleton is None:
+            # Only the first construction takes the lock; later calls just return
+            with cls._init_lock:
+                if cls._singleton is None:
+                    agent = super().__new__(cls)
+                    agent._setup()
+                    # Published only once set up, so no thread sees a half-built agent
+                    cls._singleton = agent
+        return cls._singleton
+
+    @classmethod
+    def get(cls) -> 'HttpAgent':
+        """Return the shared agent."""
+        return cls()
 
-    def __init__(self):
+    def _setup(self):
         """
         Initialize the HTTP agent with session caching and user agent emulation.
         """
         self._client = requests.Session()
-        self._base = SERVICE_ROOT
+        # Larger keep-alive pool than urllib3's default of 10, with transparent
+        # retries on throttling and gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            pool_block=False,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"])
+            )
+        )
+        self._client.mount("https://", adapter)
+        self._client.mount("http://", adapter)
+        self._base = service_root()
         self._default_headers = {
             "User-Agent": (
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_11_4) "
@@ -32,6 +88,47 @@ class HttpAgent:
                 "Chrome/52.0.2743.116 Safari/537.36"
             )
         }
+        # Sent with every request by the session itself
+        self._client.headers.update(self._default_headers)
+        # (url, mime, payload) -> (stored_at, response body) for successful GETs
+        self._get_cache: OrderedDict = OrderedDict()
+        # (verb, mime) -> handler(url, payload, attachments, mime); a None mime
+        # is the verb's fallback for any other content type
+        post = self._client.post
+        self._routes = {
+            ("get", None): lambda url, data, files, mime: self._cached_get(url, data, mime),
+            ("post", "multipart/form-data"): lambda url, data, files, mime: post(
+                url, files=files, data=data, timeout=self.TIMEOUT).json(),
+            ("post", "application/json"): lambda url, data, files, mime: post(
+                url, json=data, timeout=self.TIMEOUT).json(),
+            ("post", None): lambda url, data, files, mime: post(
+                url, data=data, timeout=self.TIMEOUT).json(),
+        }
+
+    def _cached_get(self, url: str, payload: dict, mime: str) -> dict:
+        """
+        GET `url`, answering repeats of the same request from memory. Bodies are
+        cached as text and decoded per call, so callers never share a dict.
+        """
+        key = (url, mime, json.dumps(payload, sort_keys=True, default=str))
+        hit = self._get_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < self.GET_CACHE_TTL:
+            self._get_cache.move_to_end(key)
+            return json.loads(hit[1])
+
+        response = self._client.get(
+            url,
+            json=payload if mime == "application/json" else None,
+            params=payload if mime != "application/json" else None,
+            timeout=self.TIMEOUT
+        )
+        result = response.json()
+        if response.ok:
+            self._get_cache[key] = (time.monotonic(), response.text)
+            self._get_cache.move_to_end(key)
+            while len(self._get_cache) > self.GET_CACHE_SIZE:
+                self._get_cache.popitem(last=False)
+        return result
 
     def dispatch(
         self,
@@ -54,49 +151,14 @@ class HttpAgent:
         Returns:
             dict | None: Server JSON response, or None on failure.
         """
-        full_url = f"{self._base}{endpoint}"
-        try:
-            action = method.lower()
-
-            if action == "get":
-                response = self._client.get(
-                    full_url,
-                    json=payload if mime == "application/json" else None,
-                    params=payload if mime != "application/json" else None,
-                    headers=self._default_headers,
-                    timeout=60
-                )
-
-            elif action == "post":
-                if mime == "multipart/form-data":
-                    response = self._client.post(
-                        full_url,
-                        files=attachments,
-                        data=payload,
-                        headers=self._default_headers,
-                        timeout=60
-                    )
-                elif mime == "application/json":
-                    response = self._client.post(
-                        full_url,
-                        json=payload,
-                        headers=self._default_headers,
-                        timeout=60
-                    )
-                else:
-                    response = self._client.post(
-                        full_url,
-                        data=payload,
-                        headers=self._default_headers,
-                        timeout=60
-                    )
-
-            else:
-                print("Unsupported HTTP verb specified.")
-                return None
-
-            return response.json()
+        action = method.lower()
+        handler = self._routes.get((action, mime)) or self._routes.get((action, None))
+        if handler is None:
+            print("Unsupported HTTP verb specified.")
+            return None
 
-        except Exception as err:
+        try:
+            return handler(self._base + endpoint, payload, attachments, mime)
+        except (requests.RequestException, ValueError) as err:
             print(f"[HTTP ERROR] {err}")
             return None
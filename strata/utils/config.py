@@ -2,12 +2,14 @@ import os
 import sys
 import logging
 import argparse
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from strata.utils.utils import random_string as gen_id, get_project_root_path as project_root
-import dotenv
+from strata.utils.env_bootstrap import ensure as ensure_env
 
-dotenv.load_dotenv(dotenv_path=".env", override=True)
+ensure_env()
 
 
 class GlobalConfig:
@@ -17,33 +19,42 @@ class GlobalConfig:
     """
     _singleton: Optional['GlobalConfig'] = None
     _payload: Dict[str, Any]
+    _init_lock = threading.Lock()
 
     def __new__(cls) -> 'GlobalConfig':
         if cls._singleton is None:
-            cls._singleton = super().__new__(cls)
-            cls._singleton._payload = {}
+            # Only the first construction takes the lock; later calls just return
+            with cls._init_lock:
+                if cls._singleton is None:
+                    obj = super().__new__(cls)
+                    obj._payload = {}
+                    cls._singleton = obj
         return cls._singleton
 
     @classmethod
     def bind(cls, parsed: argparse.Namespace) -> None:
         """Bind parsed command-line arguments into the config instance."""
-        obj = cls()
-        obj._payload = vars(parsed)
+        cls._singleton._payload = vars(parsed)
 
     @classmethod
     def fetch(cls, key: str, fallback: Any = None) -> Any:
         """Safely retrieve a config entry by key with an optional fallback."""
-        return cls()._payload.get(key, fallback)
+        return cls._singleton._payload.get(key, fallback)
 
     @classmethod
     def assign(cls, key: str, value: Any) -> None:
         """Update a specific configuration parameter."""
-        cls()._payload[key] = value
+        cls._singleton._payload[key] = value
 
 
-def configure_runtime() -> argparse.Namespace:
+# Created at import so accessors can read the instance directly
+GlobalConfig()
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parses startup options and prepares global config and log environment.
+    Construct the command-line parser once; later calls reuse it.
     """
     cli = argparse.ArgumentParser(description="LLM-Powered Automation Tool")
 
@@ -54,12 +65,13 @@ def configure_runtime() -> argparse.Namespace:
     core.add_argument("--task", type=str, default=None)
     core.add_argument("--task_file", type=str, default="")
     core.add_argument("--retries", type=int, default=3)
+    core.add_argument("--cache_root", type=str, default="cache")
 
     # Logging
     logs = cli.add_argument_group("Logging")
     logs.add_argument("--log_folder", type=str, default="log")
     logs.add_argument("--log_file", type=str, default="run.log")
-    logs.add_argument("--log_tag", type=str, default=gen_id(16))
+    logs.add_argument("--log_tag", type=str, default=None)
     logs.add_argument("--score_threshold", type=int, default=8)
 
     # Self-guided learning
@@ -79,10 +91,20 @@ def configure_runtime() -> argparse.Namespace:
     sheet = cli.add_argument_group("Sheet Task")
     sheet.add_argument("--sheet_id", type=int, default=1)
 
-    if "pytest" in sys.modules:
-        args = cli.parse_args([])
-    else:
-        args = cli.parse_args()
+    return cli
+
+
+@lru_cache(maxsize=1)
+def configure_runtime() -> argparse.Namespace:
+    """
+    Parses startup options and prepares global config and log environment.
+
+    Runs once per process; later calls (e.g. from every test class) return the
+    same namespace. Use `configure_runtime.cache_clear()` to re-parse.
+    """
+    args = _build_parser().parse_args([] if "pytest" in sys.modules else None)
+    if args.log_tag is None:
+        args.log_tag = gen_id(16)
 
     # Store config and prepare logging
     GlobalConfig.bind(args)
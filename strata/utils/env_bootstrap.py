@@ -0,0 +1,17 @@
+import dotenv
+
+_LOADED = False
+
+
+def ensure():
+    """
+    Load `.env` into the process environment, once.
+
+    Modules that read settings from the environment call this at import time;
+    only the first call opens and parses the file.
+    """
+    global _LOADED
+    if _LOADED:
+        return
+    dotenv.load_dotenv(dotenv_path=".env", override=True)
+    _LOADED = True
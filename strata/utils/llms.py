@@ -1,21 +1,40 @@
 import os
 import sys
+import types
+import functools
+import asyncio
 import time
 import json
 import logging
+import weakref
+import importlib.util
+import httpx
 import requests
-from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
+from typing import List, Dict, Any, Optional, Iterator
+from strata.utils.env_bootstrap import ensure as ensure_env
 
-# Load environment variables (override mode)
-load_dotenv(override=True)
 
-# Environment config
-ENGINE = os.getenv("MODEL_NAME", "gpt-3.5-turbo")
-API_KEY = os.getenv("OPENAI_API_KEY")
-ORG_ID = os.getenv("OPENAI_ORGANIZATION")
-ALT_URL = os.getenv("OPENAI_BASE_URL")
-FALLBACK_ENDPOINT = os.getenv("MODEL_SERVER", "http://localhost:11434")
+@functools.lru_cache(maxsize=1)
+def llm_settings() -> types.SimpleNamespace:
+    """
+    Resolve LLM configuration from the environment on first use rather than at
+    import. Call `llm_settings.cache_clear()` to pick up changed variables.
+    """
+    ensure_env()
+    connect = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+    read = float(os.getenv("LLM_READ_TIMEOUT", "300"))
+    return types.SimpleNamespace(
+        model_name=os.getenv("MODEL_NAME", "gpt-3.5-turbo"),
+        openai_key=os.getenv("OPENAI_API_KEY"),
+        organization=os.getenv("OPENAI_ORGANIZATION"),
+        base_url=os.getenv("OPENAI_BASE_URL"),
+        model_server=os.getenv("MODEL_SERVER", "http://localhost:11434"),
+        # Fail fast on unreachable endpoints while still allowing long generations
+        connect_timeout=connect,
+        read_timeout=read,
+        http_timeout=httpx.Timeout(connect=connect, read=read, write=30.0, pool=10.0),
+    )
+
 
 # Setup logger
 logging.basicConfig(
@@ -24,6 +43,34 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# One pooled async HTTP client per event loop, created on first use. Connections
+# belong to the loop that opened them, so loops never share a client.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _async_http_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            # HTTP/2 multiplexing needs the optional `h2` package
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=llm_settings().http_timeout,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_http_clients() -> None:
+    """
+    Close the pooled async client of the running event loop, e.g. at shutdown.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
 
 class LanguageGateway:
     """
@@ -33,12 +80,24 @@ class LanguageGateway:
     def __init__(self, model: str):
         self.model = model
 
-    def interact(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "") -> str:
+    def interact(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "",
+                 response_format: Optional[Dict[str, Any]] = None) -> str:
         """
         Executes a prompt cycle and returns the language model's output.
+
+        `response_format={"type": "json_object"}` asks the backend to emit a bare
+        JSON document, so callers can `json.loads` the reply directly.
         """
         raise NotImplementedError("Concrete subclass required")
 
+    async def interact_async(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "",
+                             response_format: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Awaitable form of `interact`. The blocking request runs on a worker thread, so
+        independent prompts can be dispatched together with `asyncio.gather`.
+        """
+        return await asyncio.to_thread(self.interact, prompts, temperature, tag, response_format)
+
 
 class OpenAIWrapper(LanguageGateway):
     """
@@ -46,8 +105,8 @@ class OpenAIWrapper(LanguageGateway):
     Handles credentials and request configuration.
     """
 
-    def __init__(self, token: str, model: str = ENGINE, org: Optional[str] = None):
-        super().__init__(model)
+    def __init__(self, token: str, model: Optional[str] = None, org: Optional[str] = None):
+        super().__init__(model or llm_settings().model_name)
         self.token = token
         self.org = org
         self._init_openai()
@@ -57,16 +116,51 @@ class OpenAIWrapper(LanguageGateway):
         openai.api_key = self.token
         if self.org:
             openai.organization = self.org
-        if ALT_URL:
-            openai.base_url = ALT_URL
+        settings = llm_settings()
+        if settings.base_url:
+            openai.base_url = settings.base_url
+        openai.timeout = settings.http_timeout
         self._client = openai
 
-    def interact(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "") -> str:
+    def interact(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "",
+                 response_format: Optional[Dict[str, Any]] = None) -> str:
+        options = {"response_format": response_format} if response_format else {}
         try:
             reply = self._client.chat.completions.create(
                 model=self.model,
                 messages=prompts,
-                temperature=temperature
+                temperature=temperature,
+                **options
+            )
+            output = reply.choices[0].message.content
+            log.info(f"{tag}Result: {output[:200]}...")
+            return output
+        except Exception as err:
+            log.error(f"[OpenAI] Failure: {err}")
+            raise
+
+    async def interact_async(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "",
+                             response_format: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Native async request over the shared connection pool, so concurrent
+        prompts reuse keep-alive connections instead of each opening its own.
+        """
+        import openai
+        settings = llm_settings()
+        options = {"response_format": response_format} if response_format else {}
+        client = openai.AsyncOpenAI(
+            api_key=self.token,
+            organization=self.org,
+            base_url=settings.base_url or None,
+            http_client=_async_http_client(),
+            timeout=settings.http_timeout,
+        )
+        try:
+            reply = await client.chat.completions.create(
+                model=self.model,
+                messages=prompts,
+                temperature=temperature,
+                **options
             )
             output = reply.choices[0].message.content
             log.info(f"{tag}Result: {output[:200]}...")
@@ -81,30 +175,88 @@ class OllamaWrapper(LanguageGateway):
     Client adapter for models hosted via Ollama API.
     """
 
-    def __init__(self, model: str = ENGINE, endpoint: str = FALLBACK_ENDPOINT):
-        super().__init__(model)
-        self.api_url = f"{endpoint}/api/chat"
+    def __init__(self, model: Optional[str] = None, endpoint: Optional[str] = None):
+        settings = llm_settings()
+        super().__init__(model or settings.model_name)
+        self.api_url = f"{endpoint or settings.model_server}/api/chat"
+        # Keep-alive pool so consecutive prompts skip the TCP handshake
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=64)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Closes the pool when the wrapper is collected or at interpreter exit,
+        # without atexit keeping every wrapper alive
+        self._finalizer = weakref.finalize(self, self._session.close)
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self._finalizer()
 
-    def interact(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "") -> str:
+    def _request(self, prompts: List[Dict[str, str]], temperature: float,
+                 response_format: Optional[Dict[str, Any]], stream: bool = False) -> Dict[str, Any]:
         req = {
             "model": self.model,
             "messages": prompts,
             "temperature": temperature,
-            "stream": False
+            "stream": stream
         }
+        if response_format:
+            # Ollama only knows a generic JSON mode
+            req["format"] = "json"
+        return req
+
+    def stream_interact(self, prompts: List[Dict[str, str]], temperature: float = 0.0,
+                        response_format: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Yield the reply piece by piece as Ollama generates it, so consumers can
+        start work before the last token arrives.
 
+        Raises:
+            RuntimeError: If Ollama reports an error mid-stream, or the stream ends
+                without a `done` chunk (the reply would otherwise be silently cut short).
+        """
+        req = self._request(prompts, temperature, response_format, stream=True)
+        with self._session.post(
+            self.api_url,
+            json=req,
+            headers={"Content-Type": "application/json"},
+            timeout=(llm_settings().connect_timeout, llm_settings().read_timeout),
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                delta = chunk.get("message", {}).get("content")
+                if delta:
+                    yield delta
+                if chunk.get("done"):
+                    return
+            raise RuntimeError("Ollama stream ended before the reply was done")
+
+    def interact(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "",
+                 response_format: Optional[Dict[str, Any]] = None) -> str:
         try:
-            response = requests.post(
-                self.api_url,
-                json=req,
-                headers={"Content-Type": "application/json"},
-                timeout=300
-            )
+            text = "".join(self.stream_interact(prompts, temperature, response_format))
+            log.info(f"{tag}Result: {text[:200]}...")
+            return text
+        except (requests.RequestException, RuntimeError, KeyError, json.JSONDecodeError) as err:
+            log.error(f"[Ollama] Failed to process response: {err}")
+            raise
+
+    async def interact_async(self, prompts: List[Dict[str, str]], temperature: float = 0.0, tag: str = "",
+                             response_format: Optional[Dict[str, Any]] = None) -> str:
+        req = self._request(prompts, temperature, response_format)
+        try:
+            response = await _async_http_client().post(self.api_url, json=req)
             response.raise_for_status()
             text = response.json()["message"]["content"]
             log.info(f"{tag}Result: {text[:200]}...")
             return text
-        except (requests.RequestException, KeyError, json.JSONDecodeError) as err:
+        except (httpx.HTTPError, KeyError, json.JSONDecodeError) as err:
             log.error(f"[Ollama] Failed to process response: {err}")
             raise
 
@@ -113,10 +265,11 @@ def get_llm() -> LanguageGateway:
     """
     Instantiate the appropriate LLM backend depending on available credentials.
     """
-    if API_KEY:
-        return OpenAIWrapper(token=API_KEY, model=ENGINE, org=ORG_ID)
-    if FALLBACK_ENDPOINT:
-        return OllamaWrapper(model=ENGINE, endpoint=FALLBACK_ENDPOINT)
+    settings = llm_settings()
+    if settings.openai_key:
+        return OpenAIWrapper(token=settings.openai_key, model=settings.model_name, org=settings.organization)
+    if settings.model_server:
+        return OllamaWrapper(model=settings.model_name, endpoint=settings.model_server)
     raise RuntimeError("Missing LLM configuration")
 
 
@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from strata.utils.config import GlobalConfig
+
+
+def default_cache_dir(name):
+    """Directory `name` under the configured `--cache_root`."""
+    return os.path.join(GlobalConfig.fetch("cache_root") or "cache", name)
+
+
+class PlanCache:
+    """
+    Content-addressed, on-disk store for decomposed task plans.
+
+    Each entry is a JSON file named after the SHA-256 fingerprint of the planning
+    inputs. Entries older than `ttl` seconds are treated as misses, and once the
+    directory grows past `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir=None, ttl=7 * 24 * 3600, max_bytes=100 * 1024 * 1024):
+        """
+        Args:
+            cache_dir (str, optional): Directory holding cached plans. Defaults to
+                `plan_cache` under the configured cache root.
+            ttl (int): Seconds after which a cached plan expires.
+            max_bytes (int): Upper bound on the total size of the cache directory.
+        """
+        self.cache_dir = cache_dir or default_cache_dir("plan_cache")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(task, tool_catalog, api_list, working_dir, files_and_folders, system_version):
+        """
+        Fingerprint the planning inputs.
+
+        `tool_catalog` is expected in the serialized form already built for the
+        prompt, so the key costs no second JSON encoding of the catalog.
+
+        The directory listing is reduced to its sorted entry names so that file
+        sizes, which change constantly, do not defeat the cache.
+
+        Returns:
+            str: Hex digest identifying the plan.
+        """
+        names = sorted(line.split("\t", 1)[0] for line in files_and_folders.splitlines() if line)
+        payload = {
+            "task": task.strip(),
+            "tool_catalog": tool_catalog,
+            "api_list": api_list,
+            "working_dir": working_dir,
+            "files_and_folders": names,
+            "system_version": system_version,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Look up a cached plan.
+
+        Returns:
+            dict | None: The cached plan, or None on a miss or expired entry.
+        """
+        path = self._path(key)
+        try:
+            mtime = os.path.getmtime(path)
+            if time.time() - mtime > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                plan = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        # Bump atime so eviction keeps recently used plans; another process may
+        # have evicted the entry since it was read
+        try:
+            os.utime(path, (time.time(), mtime))
+        except FileNotFoundError:
+            pass
+        return plan
+
+    def put(self, key, plan):
+        """
+        Store a plan atomically, then enforce the size bound.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(plan, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_atime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
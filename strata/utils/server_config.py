@@ -1,6 +1,9 @@
 import os
 from typing import Optional
 
+# Marks "nothing written to os.environ yet", distinct from a None proxy
+_UNSET = object()
+
 
 class EnvTuner:
     """
@@ -27,6 +30,9 @@ class EnvTuner:
             cls._singleton = super().__new__(cls)
             cls._singleton._http = "http://127.0.0.1:10809"
             cls._singleton._https = "http://127.0.0.1:10809"
+            # Values last written to os.environ, so repeat calls skip putenv
+            cls._singleton._applied_http = _UNSET
+            cls._singleton._applied_https = _UNSET
         return cls._singleton
 
     def configure(self, http: Optional[str], https: Optional[str]) -> None:
@@ -44,14 +50,20 @@ class EnvTuner:
         """
         Pushes proxy routing to the process environment.
         """
-        if self._http:
+        if self._http and self._http != self._applied_http:
             os.environ["http_proxy"] = self._http
-        if self._https:
+            self._applied_http = self._http
+        if self._https and self._https != self._applied_https:
             os.environ["https_proxy"] = self._https
+            self._applied_https = self._https
 
     def reset(self) -> None:
         """
         Clears any routing configurations from the environment.
         """
-        os.environ.pop("http_proxy", None)
-        os.environ.pop("https_proxy", None)
+        if self._applied_http is not None:
+            os.environ.pop("http_proxy", None)
+            self._applied_http = None
+        if self._applied_https is not None:
+            os.environ.pop("https_proxy", None)
+            self._applied_https = None
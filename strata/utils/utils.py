@@ -1,32 +1,91 @@
 import os
 import re
+import asyncio
 import json
-import copy
+import mmap
 import string
 import random
+import time
 import logging
 import platform
 import itertools
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Any, Dict, List, Optional, Generator, Tuple
 
 import numpy as np
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 import tiktoken
-from datasets import load_dataset
+
+try:
+    import orjson
+
+    def _loads(raw: bytes | str) -> Any:
+        return orjson.loads(raw)
+
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        # orjson only indents by two spaces; pretty files keep the stdlib's four
+        if indent:
+            return json.dumps(obj, indent=4).encode()
+        # Accept int/float keys like the stdlib does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:  # optional speed-up; stdlib json is used otherwise
+    def _loads(raw: bytes | str) -> Any:
+        return json.loads(raw)
+
+    def _dumps(obj: Any, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=4 if indent else None).encode()
 
 from strata.prompts.general_pt import prompt as gpt_prompts
 from strata.utils.llms import OpenAI
 
 
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # optional; BeautifulSoup handles HTML otherwise
+    SelectolaxParser = None
+
+_DROP_PRINTABLE = str.maketrans("", "", string.printable)
+
+# sanitize_string: single-char rewrites in one translate pass, then two regexes
+_SANITIZE_TABLE = str.maketrans({"\n": " ", "\\": None, "#": " "})
+_WHITESPACE_RE = re.compile(r"\s+")
+_REPEATED_SYMBOL_RE = re.compile(r"([^\w\s])\1+")
+
+# Page chrome stripped before extracting text
+_BOILERPLATE_SELECTOR = (
+    "nav, aside, form, header, noscript, svg, canvas, footer, script, style, "
+    "#sidebar, #main-navigation, #menu-main-menu, "
+    ".elementor-location-header, .navbar-header, .nav, "
+    ".header-sidebar-wrapper, .blog-sidebar-wrapper, .related-posts"
+)
+# Cheap raw-text check for anything the selector could match; pages with no hit
+# skip the sweep entirely. Ids and classes are matched loosely (any mention).
+_BOILERPLATE_HINT_RE = re.compile(
+    r"<(?:nav|aside|form|header|noscript|svg|canvas|footer|script|style)\b"
+    r"|sidebar|main-navigation|menu-main-menu|elementor-location-header"
+    r"|navbar-header|nav|related-posts",
+    re.IGNORECASE
+)
+
+
 # --- File Operations ---
 def export_to_json(path: str, data: Dict[str, Any] | List[Any]) -> None:
+    if path.endswith('.jsonl'):
+        # Line-delimited files are appended to, never re-read or rewritten
+        records = data if isinstance(data, list) else [data]
+        if not records:
+            return
+        with open(path, 'ab') as file:
+            file.write(b'\n'.join(_dumps(item) for item in records) + b'\n')
+        return
+
     if os.path.exists(path):
         try:
-            with open(path, 'r') as file:
-                existing = json.load(file)
-        except json.JSONDecodeError as err:
+            with open(path, 'rb') as file:
+                raw = file.read()
+            existing = _loads(raw)
+        except ValueError as err:
             logging.error(f"Corrupt JSON: {err}")
             return
 
@@ -41,18 +100,21 @@ def export_to_json(path: str, data: Dict[str, Any] | List[Any]) -> None:
             logging.warning("Data type mismatch. Cannot update JSON.")
             return
 
-        with open(path, 'w') as file:
-            json.dump(existing, file, indent=4)
+        with open(path, 'wb') as file:
+            file.write(_dumps(existing, indent=True))
     else:
-        with open(path, 'w') as file:
-            json.dump(data, file, indent=4)
+        with open(path, 'wb') as file:
+            file.write(_dumps(data, indent=True))
 
 
 def import_from_json(path: str) -> Dict[str, Any] | List[Any]:
     try:
-        with open(path, 'r') as file:
-            return json.load(file)
-    except (json.JSONDecodeError, FileNotFoundError) as err:
+        with open(path, 'rb') as file:
+            raw = file.read()
+        if path.endswith('.jsonl'):
+            return [_loads(line) for line in raw.splitlines() if line.strip()]
+        return _loads(raw)
+    except (ValueError, FileNotFoundError) as err:
         logging.error(f"Load error: {err}")
         raise
 
@@ -62,9 +124,13 @@ def random_id(length: int) -> str:
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
 
 
-def count_tokens(text: str) -> int:
-    tokenizer = tiktoken.encoding_for_model('gpt-4-1106-preview')
-    return len(tokenizer.encode(text))
+@lru_cache(maxsize=4)
+def _token_encoder(model: str = 'gpt-4-1106-preview') -> "tiktoken.Encoding":
+    return tiktoken.encoding_for_model(model)
+
+
+def count_tokens(text: str, model: str = 'gpt-4-1106-preview') -> int:
+    return len(_token_encoder(model).encode(text))
 
 
 def extract_text_from_html(html: str, parser: str = "html.parser") -> str:
@@ -72,21 +138,26 @@ def extract_text_from_html(html: str, parser: str = "html.parser") -> str:
     if parser not in allowed_parsers:
         raise ValueError(f"Parser '{parser}' is invalid. Choose from {allowed_parsers}.")
 
-    dom = BeautifulSoup(html, parser)
-    original_len = len(dom.get_text())
-
-    for el in dom(["nav", "aside", "form", "header", "noscript", "svg", "canvas", "footer", "script", "style"]):
-        el.decompose()
-
-    for target_id in ["sidebar", "main-navigation", "menu-main-menu"]:
-        for el in dom.find_all(id=target_id):
-            el.decompose()
-
-    for class_name in ["elementor-location-header", "navbar-header", "nav", "header-sidebar-wrapper", "blog-sidebar-wrapper", "related-posts"]:
-        for el in dom.find_all(class_=class_name):
-            el.decompose()
-
-    clean_text = sanitize_string(dom.get_text())
+    needs_sweep = _BOILERPLATE_HINT_RE.search(html) is not None
+    if parser == "html.parser" and SelectolaxParser is not None:
+        # C parser: one CSS sweep instead of a pure-Python tree walk
+        tree = SelectolaxParser(html)
+        raw_text = tree.text()
+        original_len = len(raw_text)
+        if needs_sweep:
+            for el in tree.css(_BOILERPLATE_SELECTOR):
+                el.decompose()
+            raw_text = tree.text()
+    else:
+        dom = BeautifulSoup(html, parser)
+        raw_text = dom.get_text()
+        original_len = len(raw_text)
+        if needs_sweep:
+            for el in dom.select(_BOILERPLATE_SELECTOR):
+                el.decompose()
+            raw_text = dom.get_text()
+
+    clean_text = sanitize_string(raw_text)
     if original_len:
         shrink = round((1 - len(clean_text) / original_len) * 100, 2)
         logging.info(f"Trimmed HTML text to {len(clean_text)} chars ({shrink}% reduction)")
@@ -94,15 +165,16 @@ def extract_text_from_html(html: str, parser: str = "html.parser") -> str:
 
 
 def sanitize_string(s: str) -> str:
-    s = s.replace("\n", " ")
-    s = re.sub(r"\s+", " ", s).strip()
-    s = s.replace("\\", "").replace("#", " ")
-    return re.sub(r"([^"]\w\s])\1+", r"\1", s)
+    s = s.translate(_SANITIZE_TABLE)
+    s = _WHITESPACE_RE.sub(" ", s).strip()
+    return _REPEATED_SYMBOL_RE.sub(r"\1", s)
 
 
 def mostly_printable(txt: str) -> bool:
     try:
-        return sum(c in string.printable for c in txt) / len(txt) > 0.95
+        # translate() drops every printable char in C; what is left is the rest
+        non_printable = len(txt.translate(_DROP_PRINTABLE))
+        return 1 - non_printable / len(txt) > 0.95
     except ZeroDivisionError:
         logging.warning("Blank input detected")
         return False
@@ -116,9 +188,9 @@ def preview_string(source: str, segment: int = 20) -> str:
 
 def validate_json_string(payload: str) -> bool:
     try:
-        json.loads(payload)
+        _loads(payload)
         return True
-    except json.JSONDecodeError:
+    except ValueError:
         logging.error("Bad JSON string")
         return False
 
@@ -135,23 +207,63 @@ def batch_iterator(data: List[Any], size: int = 100, label: str = "Progress") ->
             bar.update(len(batch))
 
 
+@lru_cache(maxsize=32)
+def tagged_pattern(start: str, end: str) -> "re.Pattern[str]":
+    """Compile (once per tag pair) a non-greedy pattern capturing text between the tags."""
+    return re.compile(re.escape(start) + r'(.*?)' + re.escape(end), re.DOTALL)
+
+
+@lru_cache(maxsize=128)
+def _placeholder_pattern(keys: Tuple[str, ...]) -> "re.Pattern[str]":
+    # Longest keys first so a key that prefixes another never shadows it
+    return re.compile("|".join(re.escape(k) for k in sorted(keys, key=len, reverse=True)))
+
+
 def fill_template(base: str, replacements: Dict[str, Any]) -> str:
-    result = copy.deepcopy(base)
-    for key, val in replacements.items():
-        result = result.replace(key, str(val))
-    return result
+    if not replacements:
+        return base
+    pattern = _placeholder_pattern(tuple(replacements))
+    return pattern.sub(lambda m: str(replacements[m.group(0)]), base)
+
+
+@lru_cache(maxsize=None)
+def _split_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            # Indexing, attributes or format specs need the full str.format machinery
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def render_template(template: str, **fields: Any) -> str:
+    """
+    Equivalent of `template.format(**fields)` for plain `{name}` templates, with the
+    template parsed only once per process.
+    """
+    parts = _split_template(template)
+    if parts is None:
+        return template.format(**fields)
+    return "".join(
+        literal if name is None else literal + str(fields[name])
+        for literal, name in parts
+    )
 
 
 def cosine_sim(vec1: np.ndarray, vec2: np.ndarray) -> float:
     return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
 
 
-def query_llm(system_msg: str, user_msg: str, model: OpenAI, tag: str = "") -> str:
+def query_llm(system_msg: str, user_msg: str, model: OpenAI, tag: str = "",
+              response_format: Optional[Dict[str, Any]] = None) -> str:
     conversation = [
         {"role": "system", "content": system_msg},
         {"role": "user", "content": user_msg}
     ]
-    return model.chat(conversation, prefix=tag)
+    if response_format is None:
+        return model.chat(conversation, prefix=tag)
+    return model.chat(conversation, prefix=tag, response_format=response_format)
 
 
 def get_repo_root() -> str:
@@ -168,7 +280,12 @@ def refine_response_for_gaia(question: str, output: str) -> str:
 # --- GAIA Loader ---
 class GaiaDataLoader:
     def __init__(self, level: int = 1, cache: Optional[str] = None):
+        # Deferred: `datasets` drags in pyarrow/pandas and only GAIA runs need it
+        from datasets import load_dataset
+
         self.cache = cache
+        # split -> {task_id: row index}, built the first time a split is queried
+        self._id_index: Dict[str, Dict[str, int]] = {}
         try:
             args = {"path": "gaia-benchmark/GAIA", "name": f"2023_level{level}"}
             if cache:
@@ -184,15 +301,18 @@ class GaiaDataLoader:
         if split not in self.dataset:
             logging.warning(f"Invalid split: {split}")
             return None
-        for item in self.dataset[split]:
-            if item['task_id'] == uid:
-                return item
-        return None
+        index = self._id_index.get(split)
+        if index is None:
+            rows = self.dataset[split]
+            index = {task_id: i for i, task_id in enumerate(rows['task_id'])}
+            self._id_index[split] = index
+        pos = index.get(uid)
+        return None if pos is None else self.dataset[split][pos]
 
     def construct_query(self, task: Dict[str, Any]) -> str:
         query = f"Your task is: {task['Question']}"
         if task.get('file_name'):
-            extension = task['file_name'].split('.')[-1]
+            extension = task['file_name'].rpartition('.')[2]
             query += f"\nThe file path is {task['file_path']}, which is a {extension} file."
         logging.info(f"Loaded GAIA task {task['task_id']}")
         return query
@@ -203,6 +323,10 @@ class SpreadsheetTaskLoader:
     def __init__(self, path: Optional[str] = None):
         self.path = path
         self.dataset = []
+        # Raw records in file order, parsed once alongside the queries
+        self.records: List[Dict[str, Any]] = []
+        # explicit record id -> position, built by get_task_by_id on first use
+        self._id_index: Optional[Dict[Any, int]] = None
         if path:
             if not os.path.exists(path):
                 raise FileNotFoundError(f"Missing sheet data: {path}")
@@ -216,15 +340,22 @@ class SpreadsheetTaskLoader:
 
     def _load_from_jsonl(self) -> List[str]:
         result = []
-        with open(self.path, 'r') as f:
-            for line in f:
-                record = json.loads(line)
-                query = self._format_query(
-                    context=record['Context'],
-                    instructions=record['Instructions'],
-                    file_path=get_repo_root() + record['file_path']
-                )
-                result.append(query)
+        root = get_repo_root()
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return result
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    if not line.strip():
+                        continue
+                    record = _loads(line)
+                    self.records.append(record)
+                    query = self._format_query(
+                        context=record['Context'],
+                        instructions=record['Instructions'],
+                        file_path=root + record['file_path']
+                    )
+                    result.append(query)
         return result
 
     def _format_query(self, context: str, instructions: str, file_path: str) -> str:
@@ -239,8 +370,22 @@ Refer to this file: {file_path} for all operations."""
             raise ValueError("No task data available")
         return self.dataset[index]
 
+    def get_task_by_id(self, task_id: Any) -> str:
+        """
+        Return the query whose record carries `'id': task_id`. Only explicit ids
+        are indexed, never positions; the index is built on first use.
+        """
+        if not self.dataset:
+            raise ValueError("No task data available")
+        if self._id_index is None:
+            self._id_index = {
+                record['id']: pos for pos, record in enumerate(self.records) if 'id' in record
+            }
+        return self.dataset[self._id_index[task_id]]
+
 
 # --- OS Info ---
+@lru_cache(maxsize=1)
 def fetch_os_info() -> str:
     os_name = platform.system()
     if os_name == "Darwin":
@@ -265,16 +410,62 @@ def assert_os_compatibility(ver: str) -> None:
 
 
 # --- Retry Mechanism ---
-def retry_on_failure(max_tries: int = 3):
+def _transient_errors() -> Tuple[type, ...]:
+    errors: List[type] = [TimeoutError, ConnectionError]
+    try:
+        import httpx
+        errors += [httpx.TimeoutException, httpx.TransportError]
+    except ImportError:
+        pass
+    try:
+        import requests
+        errors += [requests.Timeout, requests.ConnectionError]
+    except ImportError:
+        pass
+    try:
+        import openai
+        errors += [openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError]
+    except (ImportError, AttributeError):
+        pass
+    return tuple(errors)
+
+
+# Failures worth waiting out; anything else (e.g. a malformed model reply) is retried at once
+TRANSIENT_ERRORS = _transient_errors()
+
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    # Exponential growth with +/-50% jitter so parallel callers do not retry in lockstep
+    return min(cap, base * 2 ** (attempt - 1)) * (0.5 + random.random())
+
+
+def retry_on_failure(max_tries: int = 3, base: float = 0.5, cap: float = 10.0,
+                     retry_on: Tuple[type, ...] = (Exception,)):
     def outer(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapped_async(*args, **kwargs):
+                for attempt in range(1, max_tries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except retry_on as err:
+                        logging.error(f"Retry {attempt}/{max_tries} failed: {err}")
+                        if attempt == max_tries:
+                            raise
+                        if isinstance(err, TRANSIENT_ERRORS):
+                            await asyncio.sleep(_backoff_delay(attempt, base, cap))
+            return wrapped_async
+
         @wraps(func)
         def wrapped(*args, **kwargs):
             for attempt in range(1, max_tries + 1):
                 try:
                     return func(*args, **kwargs)
-                except Exception as err:
+                except retry_on as err:
                     logging.error(f"Retry {attempt}/{max_tries} failed: {err}")
                     if attempt == max_tries:
                         raise
+                    if isinstance(err, TRANSIENT_ERRORS):
+                        time.sleep(_backoff_delay(attempt, base, cap))
         return wrapped
     return outer
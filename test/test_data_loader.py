@@ -1,25 +1,23 @@
 import pytest
 from stratapilot.utils import SheetTaskLoader as TaskSheetHandler, get_project_root_path as fetch_root_dir
 
+@pytest.fixture(scope="class")
+def sheet_loader(request):
+    """
+    Prepares the TaskSheetHandler once for the class, loading
+    the predefined sample file.
+    """
+    file_location = fetch_root_dir() + "/examples/SheetCopilot/sheet_task.jsonl"
+    request.cls.loader = TaskSheetHandler(file_location)
+
+
+@pytest.mark.usefixtures("sheet_loader")
 class TestTaskSheetHandler:
     """
     Validates functionality of TaskSheetHandler including:
     string conversion, dataset retrieval, and entry access by index.
     """
 
-    def setup_method(self, test_func):
-        """
-        Prepares test environment for TaskSheetHandler.
-
-        This method runs before each test case and sets up
-        the handler with a predefined sample file.
-
-        Args:
-            test_func: Reference to the test function being run (not used).
-        """
-        file_location = fetch_root_dir() + "/examples/SheetCopilot/sheet_task.jsonl"
-        self.loader = TaskSheetHandler(file_location)
-
     def test_generate_query_from_task(self):
         """
         Asserts that the handler generates a query string when given task input.
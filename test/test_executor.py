@@ -2,7 +2,22 @@ import pytest
 from stratapilot.utils import setup_config
 from stratapilot import FridayExecutor, ToolManager
 from stratapilot.prompts.friday_pt import prompt as execution_prompt_set
+from stratapilot.utils.plan_cache import PlanCache
 
+@pytest.fixture(scope="class")
+def executor_setup(request):
+    """
+    Initializes the test environment once for the class.
+
+    This includes loading essential runtime settings and configuring
+    the executor with proper prompting strategies and tool interfacing.
+    """
+    setup_config()
+    request.cls.instruction_template = execution_prompt_set['execute_prompt']
+    request.cls.engine = FridayExecutor(request.cls.instruction_template, ToolManager)
+
+
+@pytest.mark.usefixtures("executor_setup")
 class FunctionalValidator:
     """
     Test suite validating code and command generation logic
@@ -11,17 +26,6 @@ class FunctionalValidator:
     It checks that executable output is properly formed from given tasks.
     """
 
-    def setup_method(self, _):
-        """
-        Initializes the test environment before each individual check.
-
-        This includes loading essential runtime settings and configuring
-        the executor with proper prompting strategies and tool interfacing.
-        """
-        setup_config()
-        self.instruction_template = execution_prompt_set['execute_prompt']
-        self.engine = FridayExecutor(self.instruction_template, ToolManager)
-
     def test_tool_creation_output(self):
         """
         Confirms that functional logic generation yields usable output.
@@ -47,5 +51,80 @@ class FunctionalValidator:
             "Expected either code or a callable command, but got none."
         )
 
+
+@pytest.mark.usefixtures("executor_setup")
+class TestToolCache:
+    """
+    Checks that generated tools are reused only after passing judging.
+
+    The model is replaced by canned replies, so these run without an LLM.
+    """
+
+    def test_record_success_reuses_judged_tool(self, tmp_path, monkeypatch):
+        """
+        Confirms a tool is only reused once the judge has accepted it.
+
+        The model is replaced by a canned reply that counts its calls; the
+        second request for the same tool must be served from the skill cache.
+        """
+        calls = []
+
+        def canned_reply(*args, **kwargs):
+            calls.append(args)
+            return "```python\ndef count_files():\n    return 3\n```\n<invoke>count_files()</invoke>"
+
+        monkeypatch.setattr(self.engine, "_chat", canned_reply)
+        monkeypatch.setattr(self.engine, "skill_cache", PlanCache(str(tmp_path / "skill")))
+        request = ("count_files", "Count the files in the working directory.", "Python", "", {})
+
+        first = self.engine.compose_tool(*request)
+        self.engine.record_success("count_files")
+        second = self.engine.compose_tool(*request)
+
+        assert first == second == ("def count_files():\n    return 3", "count_files()")
+        assert len(calls) == 1, "Judged tool was regenerated instead of reused."
+
+    def test_judged_tool_not_reused_in_other_working_dir(self, tmp_path, monkeypatch):
+        """
+        Confirms a judged tool is regenerated once the working directory changes,
+        since its code may hard-code paths from the old one.
+        """
+        calls = []
+
+        def canned_reply(*args, **kwargs):
+            calls.append(args)
+            return "```python\ndef list_dir():\n    return 1\n```\n<invoke>list_dir()</invoke>"
+
+        monkeypatch.setattr(self.engine, "_chat", canned_reply)
+        monkeypatch.setattr(self.engine, "skill_cache", PlanCache(str(tmp_path / "skill")))
+        request = ("list_dir", "List the working directory.", "Python", "", {})
+
+        self.engine.compose_tool(*request)
+        self.engine.record_success("list_dir")
+        monkeypatch.setattr(self.engine.environment, "working_dir", str(tmp_path / "elsewhere"))
+        self.engine.compose_tool(*request)
+
+        assert len(calls) == 2, "Judged tool was replayed for a different working directory."
+
+    def test_unjudged_generation_is_not_cached(self, tmp_path, monkeypatch):
+        """
+        Confirms code that never passed judging is generated afresh next time.
+        """
+        calls = []
+
+        def canned_reply(*args, **kwargs):
+            calls.append(args)
+            return "```shell\nls | wc -l\n```"
+
+        monkeypatch.setattr(self.engine, "_chat", canned_reply)
+        monkeypatch.setattr(self.engine, "skill_cache", PlanCache(str(tmp_path / "skill")))
+        request = ("count_entries", "Count the entries in the working directory.", "Shell", "", {})
+
+        self.engine.compose_tool(*request)
+        self.engine.compose_tool(*request)
+
+        assert len(calls) == 2, "Unjudged code was replayed from the cache."
+        assert not list((tmp_path / "skill").glob("*.json"))
+
 if __name__ == "__main__":
     pytest.main()
@@ -2,7 +2,22 @@ import pytest
 from stratapilot.utils import setup_config
 from stratapilot import FridayPlanner, ToolManager
 from stratapilot.prompts.friday_pt import prompt as planning_templates
+from stratapilot.tools.manager.action_node import WorkflowUnit
 
+@pytest.fixture(scope="class")
+def planner_setup(request):
+    """
+    Sets up required test conditions once for the class.
+
+    Initializes global configs and prepares the planning engine using
+    a fixed instruction prompt tailored for task breakdown.
+    """
+    setup_config()
+    request.cls.template = planning_templates['planning_prompt']
+    request.cls.analyzer = FridayPlanner(request.cls.template)
+
+
+@pytest.mark.usefixtures("planner_setup")
 class TaskSegmentationSuite:
     """
     Test collection for verifying the breakdown logic of the FridayPlanner module.
@@ -10,17 +25,6 @@ class TaskSegmentationSuite:
     Validates that complex objectives are correctly parsed into discrete operations.
     """
 
-    def setup_method(self, _):
-        """
-        Sets up required test conditions before each individual case runs.
-
-        Initializes global configs and prepares the planning engine using
-        a fixed instruction prompt tailored for task breakdown.
-        """
-        setup_config()
-        self.template = planning_templates['planning_prompt']
-        self.analyzer = FridayPlanner(self.template)
-
     def test_simple_breakdown(self):
         """
         Verifies that even minimal tasks are translated into structured plans.
@@ -36,5 +40,40 @@ class TaskSegmentationSuite:
         assert self.analyzer.sub_task_list, \
             "Planner failed to generate any actionable items from the instruction."
 
+
+@pytest.fixture
+def fresh_planner():
+    """
+    Builds a planner private to one test, so graph edits never reach the
+    class-scoped analyzer shared by the decomposition tests.
+    """
+    setup_config()
+    return FridayPlanner(planning_templates['planning_prompt'])
+
+
+class TestWorkflowUnitPatching:
+    """
+    Checks that post-execution updates are written onto real WorkflowUnit nodes.
+    """
+
+    def test_patch_tool_info_on_workflow_unit(self, fresh_planner):
+        """
+        Confirms post-execution details land on a real WorkflowUnit.
+
+        The unit uses __slots__, so the planner must write through its
+        slot-backed fields rather than ad hoc attributes.
+        """
+        unit = WorkflowUnit("read_file", "Read the input file", "Code")
+        fresh_planner.node_map["read_file"] = unit
+
+        fresh_planner.patch_tool_info(
+            "read_file", output="noise\n<return>\n42\n</return>", code="print(42)", done=True
+        )
+
+        assert unit.outcome == "42"
+        assert unit.return_val == "42"
+        assert unit.assets["code"] == "print(42)"
+        assert unit.is_done and unit.status
+
 if __name__ == "__main__":
     pytest.main()
@@ -5,41 +5,46 @@ from stratapilot import (
 )
 from stratapilot.utils import setup_config
 
-class LearningFlowValidator:
+@pytest.fixture(scope="class")
+def learning_setup(request):
     """
-    Validates the end-to-end functionality of the autonomous training system.
+    Builds the agent graph once for the whole class.
 
-    Covers reading input data, forming educational content,
-    and simulating interactive sessions.
+    Loads all required runtime settings, instantiates the primary agent,
+    and binds the learning components together for downstream use.
     """
+    env = setup_config()
+    cls = request.cls
+    cls.env = env
+    cls.software = env.software_name
+    cls.bundle = env.package_name
+    cls.sample_path = env.demo_file_path
 
-    def setup_method(self, _):
-        """
-        Initializes the environment and constructs the training handler.
+    cls.mentor = FridayAgent(
+        FridayPlanner,
+        FridayRetriever,
+        FridayExecutor,
+        ToolManager,
+        config=env
+    )
 
-        Loads all required runtime settings, instantiates the primary agent,
-        and binds the learning components together for downstream use.
-        """
-        self.env = setup_config()
-        self.software = self.env.software_name
-        self.bundle = self.env.package_name
-        self.sample_path = self.env.demo_file_path
+    cls.trainer = SelfLearning(
+        agent=cls.mentor,
+        learner_cls=SelfLearner,
+        tool_manager=ToolManager,
+        config=env,
+        text_extractor_cls=TextExtractor
+    )
 
-        self.mentor = FridayAgent(
-            FridayPlanner,
-            FridayRetriever,
-            FridayExecutor,
-            ToolManager,
-            config=self.env
-        )
 
-        self.trainer = SelfLearning(
-            agent=self.mentor,
-            learner_cls=SelfLearner,
-            tool_manager=ToolManager,
-            config=self.env,
-            text_extractor_cls=TextExtractor
-        )
+@pytest.mark.usefixtures("learning_setup")
+class LearningFlowValidator:
+    """
+    Validates the end-to-end functionality of the autonomous training system.
+
+    Covers reading input data, forming educational content,
+    and simulating interactive sessions.
+    """
 
     def test_data_ingestion(self):
         """